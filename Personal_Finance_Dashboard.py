@@ -1,10 +1,7 @@
 import streamlit as st
-from dotenv import load_dotenv
 
 from backend.helpers.session_state import keep_app_session
 
-load_dotenv()
-
 page_name = "Personal Finance App"
 st.set_page_config(page_title=page_name, layout="wide")
 
@@ -1,51 +1,76 @@
-import os
 from datetime import date
 
 import streamlit as st
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 
-from formatters.formatter import CategoryListFormatter
-from queries.category import QueryCategory
+from components.database_manager.utils import get_env_variable
+from db.database import init_schema, set_sqlite_pragmas
 
-load_dotenv()
+PERSISTENT_KEYS = ("selected_year", "selected_month", "selected_categories")
 
 
 def keep_app_session() -> None:
     """
     Initializes or retains session state for selected year, month, and categories
-    in a Streamlit app, ensuring persistence across pages.
+    in a Streamlit app, ensuring persistence across pages. Every page calls it first, so
+    it also makes sure the database schema exists.
     """
-    current_year, current_month = date.today().year, date.today().month
+    init_schema()
+    today = date.today()
+    current_year, current_month = today.year, today.month
     st.session_state.setdefault("selected_year", current_year)
     st.session_state.setdefault("selected_month", current_month)
 
     if "selected_categories" not in st.session_state:
-        session_factory = session_state_session()
-        formatter = CategoryListFormatter()
-        query_category = QueryCategory(session_factory, formatter)
-        categories = query_category.execute_query()
-        st.session_state["selected_categories"] = categories
+        st.session_state["selected_categories"] = _load_categories()
 
-    if st.session_state["selected_year"]:
-        st.session_state["selected_year"] = st.session_state["selected_year"]
+    # Re-assigning widget-bound keys detaches them from their widgets, so Streamlit
+    # keeps them when a page that does not render those widgets is opened.
+    for key in PERSISTENT_KEYS:
+        st.session_state[key] = st.session_state[key]
 
-    if st.session_state["selected_month"]:
-        st.session_state["selected_month"] = st.session_state["selected_month"]
 
-    if st.session_state["selected_categories"]:
-        st.session_state["selected_categories"] = st.session_state[
-            "selected_categories"
-        ]
+@st.cache_data(ttl=3600)
+def _load_categories() -> list:
+    """
+    Fetches the expense category names shared by every browser session.
+
+    Returns:
+        A list of category names.
+    """
+    return _fetch_category_names(session_state_engine())
+
+
+def _fetch_category_names(engine: Engine) -> list[str]:
+    """
+    Fetches the expense category names with a plain SQL query, skipping ORM object construction.
+
+    Args:
+        engine: The SQLAlchemy engine to query.
+
+    Returns:
+        A list of category names ordered by ID.
+    """
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            "SELECT name FROM expenses_categories ORDER BY id"
+        )
+        return [row[0] for row in rows]
 
 
-def session_state_session() -> sessionmaker:
+@st.cache_resource
+def session_state_engine() -> Engine:
     """
-    Creates and returns a SQLAlchemy sessionmaker bound to an engine.
+    Creates and returns the SQLAlchemy engine shared across reruns.
 
     Returns:
-        A sessionmaker instance for database operations.
+        An Engine instance bound to the application database.
     """
-    engine = create_engine(f"sqlite:///{os.getenv('DB_NAME')}", pool_pre_ping=True)
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine = create_engine(
+        f"sqlite:///{get_env_variable('DB_NAME')}",
+        pool_pre_ping=True,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
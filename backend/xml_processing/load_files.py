@@ -1,6 +1,7 @@
 # backend/xml_processing/load_files.py
 from typing import List
 
+import orjson
 import streamlit as st
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
@@ -9,7 +10,7 @@ from backend.xml_processing.xml_parser import parse_xml
 
 def load_xmls(uploaded_files: List[UploadedFile]) -> List[dict]:
     """
-    Processes a list of uploaded XML files, sorts them, parses each file, 
+    Processes a list of uploaded XML files, sorts them, parses each file,
     and displays their details in the Streamlit app.
 
     Args:
@@ -24,15 +25,20 @@ def load_xmls(uploaded_files: List[UploadedFile]) -> List[dict]:
     sorted_files = sorted(uploaded_files, key=lambda x: x.name)
     files_data = []
 
+    # Parsing a payroll XML takes tens of microseconds, far less than starting worker
+    # processes, so the files are parsed in the Streamlit process itself.
     for uploaded_file in sorted_files:
-        try:
-            data = parse_xml(uploaded_file)
+        data = parse_xml(uploaded_file.getvalue())
+        if data is not None:
             files_data.append(data)
-        except Exception as e:
-            st.error(f"Error processing file {uploaded_file.name}: {e}")
-
-    if files_data:
-        with st.expander("XML Files Details"):
-            st.json(files_data)
+        else:
+            st.error(
+                f"Error processing file {uploaded_file.name}: "
+                "File is not a valid CFDI payroll XML."
+            )
+
+    if files_data and st.checkbox("Show XML details", key="xml_details_open"):
+        payload = orjson.dumps(files_data, option=orjson.OPT_INDENT_2).decode()
+        st.code(payload, language="json")
 
     return files_data
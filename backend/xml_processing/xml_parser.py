@@ -1,140 +1,307 @@
 # backend/xml_processing/xml_parser.py
-import xml.etree.ElementTree as ET
-from datetime import datetime
-from typing import Dict, Optional, Tuple
-from xml.etree.ElementTree import Element
+import io
+import re
+from datetime import date
+from typing import Dict, Optional, Tuple, Union
 
+from lxml import etree as ET
+from lxml.etree import _Element as Element
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
+CFDI_NAMESPACE_PATTERN = re.compile(
+    rb"xmlns:cfdi=([\"'])http://www\.sat\.gob\.mx/cfd/(\d+)\1"
+)
+NAMESPACE_SNIFF_BYTES = 4096
 
-def get_namespace(root: Element) -> Optional[str]:
+NOMINA_NAMESPACE = "http://www.sat.gob.mx/nomina12"
+TFD_NAMESPACE = "http://www.sat.gob.mx/TimbreFiscalDigital"
+NAMESPACES = {"nomina12": NOMINA_NAMESPACE, "tfd": TFD_NAMESPACE}
+
+# CFDI 3.2 and 3.3 share the cfd/3 namespace, CFDI 4.0 uses cfd/4.
+SUPPORTED_CFDI_VERSIONS = ("3", "4")
+NOMINA_TAG = f"{{{NOMINA_NAMESPACE}}}Nomina"
+TFD_TAG = f"{{{TFD_NAMESPACE}}}TimbreFiscalDigital"
+CFDI_TAGS: Dict[str, Tuple[str, str, str]] = {
+    version: (f"{{http://www.sat.gob.mx/cfd/{version}}}Emisor", NOMINA_TAG, TFD_TAG)
+    for version in SUPPORTED_CFDI_VERSIONS
+}
+
+RECEPTOR_XPATH = ET.XPath("nomina12:Receptor", namespaces=NAMESPACES)
+DEDUCCIONES_TAG = f"{{{NOMINA_NAMESPACE}}}Deducciones"
+DEDUCCION_TAG = f"{{{NOMINA_NAMESPACE}}}Deduccion"
+
+NOT_FOUND = "Not Found"
+ZERO_AMOUNT = "0.00"
+TIPO_DEDUCCION = "TipoDeduccion"
+IMPORTE = "Importe"
+DEDUCTION_TYPES = {"001": "imss", "002": "isr"}
+
+# Fast path for documents using the standard SAT prefixes: matches the start tag of every
+# element we need, allowing '>' inside single or double quoted attribute values.
+FAST_ELEMENT_PATTERN = re.compile(
+    rb"<(cfdi:Comprobante|cfdi:Emisor|nomina12:Nomina|nomina12:Receptor"
+    rb"|nomina12:Deduccion|tfd:TimbreFiscalDigital)\s"
+    rb"((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>"
+)
+FAST_ATTRIBUTE_PATTERN = re.compile(rb"([\w:]+)\s*=\s*([\"'])(.*?)\2", re.DOTALL)
+FAST_REQUIRED_ELEMENTS = {
+    b"cfdi:Comprobante",
+    b"cfdi:Emisor",
+    b"nomina12:Nomina",
+    b"nomina12:Receptor",
+    b"tfd:TimbreFiscalDigital",
+}
+# Attributes without a usable default; documents missing any of them take the slow path.
+FAST_REQUIRED_ATTRIBUTES = (
+    (b"cfdi:Comprobante", b"SubTotal"),
+    (b"nomina12:Nomina", b"FechaInicialPago"),
+    (b"nomina12:Nomina", b"FechaFinalPago"),
+    (b"tfd:TimbreFiscalDigital", b"UUID"),
+)
+
+
+def get_namespace(file: UploadedFile) -> Optional[str]:
+    """
+    Extracts the CFDI namespace version from the first bytes of the XML file, falling
+    back to the namespace of the root element when the declaration is not found there.
+    The file is left positioned at its start.
+
+    Args:
+        file (UploadedFile): The uploaded XML file.
+
+    Returns:
+        Optional[str]: The extracted namespace string or None if not found.
+    """
+    head = file.read(NAMESPACE_SNIFF_BYTES)
+    file.seek(0)
+    match = CFDI_NAMESPACE_PATTERN.search(head)
+    if match:
+        return match.group(2).decode()
+    return get_root_namespace(file)
+
+
+def get_root_namespace(file: UploadedFile) -> Optional[str]:
     """
-    Extracts the CFDI namespace from the XML root element.
+    Extracts the last segment of the root element namespace, reading the document only
+    up to its root start tag. The file is left positioned at its start.
 
     Args:
-        root (Element): The root element of the XML document.
+        file (UploadedFile): The uploaded XML file.
 
     Returns:
         Optional[str]: The extracted namespace string or None if not found.
     """
-    if "}" in root.tag:
-        return root.tag.split("}")[0].strip("{").split("/")[-1]
-    return None
+    try:
+        for _, root in ET.iterparse(file, events=("start",)):
+            namespace = ET.QName(root).namespace
+            return namespace.split("/")[-1] if namespace else None
+        return None
+    finally:
+        file.seek(0)
+
+
+def extract_nomina_info(nomina: Optional[Element]) -> Dict[str, str]:
+    """
+    Extracts the position, payment period and deductions from the 'Nomina' node.
+
+    Args:
+        nomina (Optional[Element]): The 'Nomina' element from the XML document.
+
+    Returns:
+        Dict[str, str]: The raw 'Nomina' values keyed by output field name.
+    """
+    if nomina is None:
+        return {
+            "position": NOT_FOUND,
+            "start_date": NOT_FOUND,
+            "end_date": NOT_FOUND,
+            "imss": ZERO_AMOUNT,
+            "isr": ZERO_AMOUNT,
+        }
 
+    receptor = RECEPTOR_XPATH(nomina)
+    imss, isr = parse_deductions(nomina)
+    return {
+        "position": receptor[0].get("Puesto", NOT_FOUND) if receptor else NOT_FOUND,
+        "start_date": nomina.get("FechaInicialPago", NOT_FOUND),
+        "end_date": nomina.get("FechaFinalPago", NOT_FOUND),
+        "imss": imss,
+        "isr": isr,
+    }
 
-def extract_emisor_nomina_info(
-    root: Element, namespaces: Dict[str, str]
-) -> Tuple[str, Optional[Element]]:
+
+def extract_cfdi_info(file: UploadedFile, cfdi_version: str) -> dict:
     """
-    Extracts common information from 'Emisor' and 'Nomina' nodes in the XML document.
+    Streams the XML document capturing only the 'Emisor', 'Nomina' and 'TimbreFiscalDigital'
+    elements. Each element is cleared once consumed and parsing stops as soon as all three are found.
 
     Args:
-        root (Element): The root element of the XML document.
-        namespaces (Dict[str, str]): The namespaces for XML parsing.
+        file (UploadedFile): The uploaded XML file.
+        cfdi_version (str): The CFDI namespace version of the document.
 
     Returns:
-        Tuple[str, Optional[Element]]: A tuple containing the name of the 'Emisor' and the 'Nomina' element.
+        dict: The raw values extracted from the document.
     """
-    emisor = root.find("cfdi:Emisor", namespaces)
-    emisor_name = (
-        emisor.get("Nombre", "Not Found") if emisor is not None else "Not Found"
+    tags = CFDI_TAGS.get(cfdi_version)
+    if tags is None:
+        raise ValueError(f"Unsupported CFDI namespace version: {cfdi_version}")
+    emisor_tag = tags[0]
+
+    info = {"client": NOT_FOUND, "gross_income": ZERO_AMOUNT, "fiscal_folio": None}
+    info.update(extract_nomina_info(None))
+    pending = set(tags)
+
+    context = ET.iterparse(
+        file,
+        events=("end",),
+        tag=tags,
+        remove_blank_text=True,
+        huge_tree=False,
     )
-    nomina = root.find(".//nomina12:Nomina", namespaces)
-    return emisor_name, nomina
+    for _, elem in context:
+        if elem.tag == emisor_tag:
+            info["client"] = elem.get("Nombre", NOT_FOUND)
+            info["gross_income"] = elem.getparent().get("SubTotal", ZERO_AMOUNT)
+        elif elem.tag == NOMINA_TAG:
+            info.update(extract_nomina_info(elem))
+        else:
+            info["fiscal_folio"] = elem.get("UUID")
+        pending.discard(elem.tag)
+
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+        if not pending:
+            break
+    del context
+    return info
+
+
+def fast_extract_cfdi_info(content: bytes) -> Optional[dict]:
+    """
+    Extracts the CFDI values by scanning the raw bytes with a regular expression, without
+    building any XML tree. Returns None whenever the document does not fit the fast path
+    (non standard prefixes, entity references, missing elements or attributes) so the
+    caller can fall back to the XML parser.
+
+    Args:
+        content (bytes): Raw content of the XML file.
+
+    Returns:
+        Optional[dict]: The raw values extracted from the document or None.
+    """
+    elements: Dict[bytes, Dict[bytes, bytes]] = {}
+    deductions = {}
+    for match in FAST_ELEMENT_PATTERN.finditer(content):
+        name, attributes = match.groups()
+        if b"&" in attributes:
+            return None
+        attrs = {
+            attribute: value
+            for attribute, _, value in FAST_ATTRIBUTE_PATTERN.findall(attributes)
+        }
+        if name == b"nomina12:Deduccion":
+            key = DEDUCTION_TYPES.get(attrs.get(b"TipoDeduccion", b"").decode())
+            if key:
+                deductions[key] = attrs.get(b"Importe", b"0.00").decode()
+        else:
+            elements.setdefault(name, attrs)
+
+    if not FAST_REQUIRED_ELEMENTS.issubset(elements):
+        return None
+    if any(
+        attribute not in elements[element]
+        for element, attribute in FAST_REQUIRED_ATTRIBUTES
+    ):
+        return None
+
+    def value(element: bytes, attribute: bytes, default: str) -> str:
+        raw = elements[element].get(attribute)
+        return raw.decode() if raw is not None else default
+
+    return {
+        "client": value(b"cfdi:Emisor", b"Nombre", NOT_FOUND),
+        "gross_income": value(b"cfdi:Comprobante", b"SubTotal", ZERO_AMOUNT),
+        "fiscal_folio": value(b"tfd:TimbreFiscalDigital", b"UUID", None),
+        "position": value(b"nomina12:Receptor", b"Puesto", NOT_FOUND),
+        "start_date": value(b"nomina12:Nomina", b"FechaInicialPago", NOT_FOUND),
+        "end_date": value(b"nomina12:Nomina", b"FechaFinalPago", NOT_FOUND),
+        "imss": deductions.get("imss", ZERO_AMOUNT),
+        "isr": deductions.get("isr", ZERO_AMOUNT),
+    }
 
 
-def parse_deductions(
-    nomina: Optional[Element], namespaces: Dict[str, str]
-) -> Tuple[str, str]:
+def parse_deductions(nomina: Optional[Element]) -> Tuple[str, str]:
     """
     Parses deduction information from the 'Nomina' node.
 
     Args:
         nomina (Optional[Element]): The 'Nomina' element from the XML document.
-        namespaces (Dict[str, str]): The namespaces for XML parsing.
 
     Returns:
         Tuple[str, str]: The extracted IMSS and ISR deduction amounts.
     """
     if nomina is None:
-        return "0.00", "0.00"
-
-    deducciones = nomina.find("nomina12:Deducciones", namespaces)
-    imss = isr = "0.00"
-    if deducciones:
-        for deduccion in deducciones.findall("nomina12:Deduccion", namespaces):
-            tipo_deduccion = deduccion.get("TipoDeduccion")
-            importe = deduccion.get("Importe", "0.00")
-            if tipo_deduccion == "001":
-                imss = importe
-                if isr != "0.00":
-                    break
-            elif tipo_deduccion == "002":
-                isr = importe
-                if imss != "0.00":
-                    break
-    return imss, isr
-
-
-def parse_xml(file_path: UploadedFile) -> Optional[dict]:
+        return ZERO_AMOUNT, ZERO_AMOUNT
+
+    deducciones = nomina.find(DEDUCCIONES_TAG)
+    if deducciones is None:
+        return ZERO_AMOUNT, ZERO_AMOUNT
+
+    found = {}
+    for deduccion in deducciones.iterchildren(tag=DEDUCCION_TAG):
+        key = DEDUCTION_TYPES.get(deduccion.get(TIPO_DEDUCCION))
+        if key:
+            found[key] = deduccion.get(IMPORTE, ZERO_AMOUNT)
+            if len(found) == len(DEDUCTION_TYPES):
+                break
+    return found.get("imss", ZERO_AMOUNT), found.get("isr", ZERO_AMOUNT)
+
+
+def parse_xml(file_path: Union[UploadedFile, bytes]) -> Optional[dict]:
     """
     Parses an individual XML file to extract payroll information and format it into an SQL insert statement.
 
     Args:
-        file_path (str): The path to the XML file.
+        file_path (Union[UploadedFile, bytes]): The uploaded XML file or its raw content.
 
     Returns:
         Optional[dict]: data dict with xml information or None in case of failure.
     """
+    content = file_path if isinstance(file_path, bytes) else file_path.getvalue()
+    file_name = getattr(file_path, "name", "<uploaded content>")
     try:
-        tree = ET.parse(file_path)
-        root = tree.getroot()
-
-        cfdi_version = get_namespace(root)
+        xml_file = io.BytesIO(content)
+        cfdi_version = get_namespace(xml_file)
         if not cfdi_version:
             raise ValueError("CFDI namespace not found in XML")
 
-        namespaces = {
-            "cfdi": f"http://www.sat.gob.mx/cfd/{cfdi_version}",
-            "nomina12": "http://www.sat.gob.mx/nomina12",
-            "tfd": "http://www.sat.gob.mx/TimbreFiscalDigital",
-        }
+        info = None
+        if cfdi_version in CFDI_TAGS:
+            info = fast_extract_cfdi_info(content)
+        if info is None:
+            info = extract_cfdi_info(xml_file, cfdi_version)
+        if info["fiscal_folio"] is None:
+            raise ValueError("TimbreFiscalDigital not found in XML")
 
-        emisor_name, nomina = extract_emisor_nomina_info(root, namespaces)
-        position = (
-            nomina.find("nomina12:Receptor", namespaces).get("Puesto", "Not Found")
-            if nomina
-            else "Not Found"
-        )
-        fecha_inicial_pago = (
-            nomina.get("FechaInicialPago", "Not Found") if nomina else "Not Found"
-        )
-        fecha_final_pago = (
-            nomina.get("FechaFinalPago", "Not Found") if nomina else "Not Found"
-        )
-        subtotal = root.get("SubTotal", "0.00")
-
-        imss, isr = parse_deductions(nomina, namespaces)
-        uuid = root.find(".//tfd:TimbreFiscalDigital", namespaces).get("UUID")
-
-        fecha_inicial_pago = datetime.strptime(fecha_inicial_pago, "%Y-%m-%d").date()
-        fecha_final_pago = datetime.strptime(fecha_final_pago, "%Y-%m-%d").date()
+        fecha_inicial_pago = date.fromisoformat(info["start_date"])
+        fecha_final_pago = date.fromisoformat(info["end_date"])
 
         data = {
             "start_date": fecha_inicial_pago,
             "end_date": fecha_final_pago,
-            "fiscal_folio": uuid,
-            "client": emisor_name,
-            "position": position,
-            "gross_income": subtotal,
-            "imss": imss,
-            "isr": isr,
+            "fiscal_folio": info["fiscal_folio"],
+            "client": info["client"],
+            "position": info["position"],
+            "gross_income": info["gross_income"],
+            "imss": info["imss"],
+            "isr": info["isr"],
         }
 
         return data
-    except ET.ParseError as e:
-        print(f"XML parsing error in file {file_path}: {e}")
+    except ET.XMLSyntaxError as e:
+        print(f"XML parsing error in file {file_name}: {e}")
         return None
     except Exception as e:
-        print(f"Unexpected error processing file {file_path}: {e}")
+        print(f"Unexpected error processing file {file_name}: {e}")
         return None
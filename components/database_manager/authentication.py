@@ -1,8 +1,12 @@
 # components/database_manager/authentication.py
-import os
+import hmac
 
 import streamlit as st
 
+from components.database_manager.utils import get_env_variable
+
+SECRET_PASSWORD = get_env_variable("DB_PASSWORD")
+
 
 def authenticate_user(action: str) -> bool:
     """
@@ -17,5 +21,6 @@ def authenticate_user(action: str) -> bool:
     password = st.text_input(
         f"Enter the password to {action}", type="password", key=f"{action}_pwd"
     )
-    secret_password = os.getenv("DB_PASSWORD")
-    return password and secret_password and password == secret_password
+    if not password or not SECRET_PASSWORD:
+        return False
+    return hmac.compare_digest(password.encode(), SECRET_PASSWORD.encode())
@@ -1,29 +1,104 @@
 # components/database_manager/tabs/download_tab.py
+import io
 import os
+import sqlite3
 from datetime import datetime
+from typing import Tuple
 
+import pyarrow.csv as pa_csv
 import streamlit as st
 
 from components.database_manager.authentication import authenticate_user
-from components.database_manager.utils import db_exists, get_project_root
+from components.database_manager.utils import DB_NAME, db_exists, get_project_root
 
 
+@st.fragment
 def database_manager_download_tab() -> None:
-    db_file_name = os.getenv("DB_NAME")
-    if db_exists(db_file_name):
+    if db_exists(DB_NAME):
         if authenticate_user("download"):
             st.subheader("Download Database")
-            download_db(db_file_name)
+            download_db(DB_NAME)
+            download_expenses_csv(DB_NAME)
     else:
         st.error("Database file not found.")
 
 
 def download_db(db_file_name: str) -> None:
     db_path = os.path.join(get_project_root(), db_file_name)
-    with open(db_path, "rb") as file:
-        st.download_button(
-            label="Download SQLite Database",
-            data=file,
-            file_name=f"{db_file_name[:-3]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db",
-            mime="application/octet-stream",
-        )
+    st.download_button(
+        label="Download SQLite Database",
+        data=_read_db_bytes(db_path, _db_mtimes(db_path)),
+        file_name=f"{db_file_name[:-3]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db",
+        mime="application/octet-stream",
+    )
+
+
+def download_expenses_csv(db_file_name: str) -> None:
+    db_path = os.path.join(get_project_root(), db_file_name)
+    st.download_button(
+        label="Download Expenses (CSV)",
+        data=_export_expenses_csv(_db_mtimes(db_path)),
+        file_name=f"expenses_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+    )
+
+
+def _db_mtimes(db_path: str) -> Tuple[float, float]:
+    """
+    Returns the modification times of the database file and of its WAL file. Committed
+    writes land in the WAL first, so both are needed to notice every change.
+
+    Args:
+        db_path (str): Absolute path to the database file.
+
+    Returns:
+        Tuple[float, float]: The database and WAL modification times; 0.0 for a missing WAL.
+    """
+    wal_path = f"{db_path}-wal"
+    wal_mtime = os.path.getmtime(wal_path) if os.path.exists(wal_path) else 0.0
+    return os.path.getmtime(db_path), wal_mtime
+
+
+@st.cache_data(ttl=60, max_entries=2)
+def _read_db_bytes(db_path: str, mtimes: Tuple[float, float]) -> bytes:
+    """
+    Takes a consistent copy of the database, including the writes still in its WAL file,
+    caching it until the database or WAL modification time changes.
+
+    Args:
+        db_path (str): Absolute path to the database file.
+        mtimes (Tuple[float, float]): Modification times of the database and WAL files,
+            used only as part of the cache key.
+
+    Returns:
+        bytes: Content of the database copy.
+    """
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(":memory:")
+    try:
+        source.backup(target)
+        return target.serialize()
+    finally:
+        target.close()
+        source.close()
+
+
+@st.cache_data(ttl=60, max_entries=2)
+def _export_expenses_csv(mtimes: Tuple[float, float]) -> bytes:
+    """
+    Exports every expense transaction as CSV, caching the result until the database or
+    WAL modification time changes.
+
+    Args:
+        mtimes (Tuple[float, float]): Modification times of the database and WAL files,
+            used only as part of the cache key.
+
+    Returns:
+        bytes: The CSV content.
+    """
+    # Imported here because the query modules need an existing database to import.
+    from db.queries.expenses import export_all_expenses
+
+    buffer = io.BytesIO()
+    pa_csv.write_csv(export_all_expenses(), buffer)
+    return buffer.getvalue()
@@ -1,17 +1,25 @@
 # components/database_manager/tabs/upload_tab.py
 import os
+import shutil
 
 import streamlit as st
 
+from backend.helpers.session_state import _load_categories, session_state_engine
 from components.database_manager.authentication import authenticate_user
-from components.database_manager.utils import db_exists, get_project_root
+from components.database_manager.utils import DB_NAME, db_exists, get_project_root
+from db.database import compile_sql, get_session_factory, init_schema
+from db.queries import bump_all_catalog_generations
+from db.queries.expenses import _expenses_query
 
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+SQLITE_SIDECAR_SUFFIXES = ("-wal", "-shm")
 
+
+@st.fragment
 def database_manager_upload_tab() -> None:
-    db_file_name = os.getenv("DB_NAME")
     if authenticate_user("upload"):
         st.subheader("Upload Database")
-        upload_db(db_file_name)
+        upload_db(DB_NAME)
 
 
 def upload_db(db_file_name: str) -> None:
@@ -19,11 +27,28 @@ def upload_db(db_file_name: str) -> None:
     if uploaded_file is not None:
         if uploaded_file.name == db_file_name:
             db_path = os.path.join(get_project_root(), db_file_name)
+            tmp_path = f"{db_path}.tmp"
             try:
-                with open(db_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
+                uploaded_file.seek(0)
+                with open(tmp_path, "wb") as f:
+                    shutil.copyfileobj(uploaded_file, f, length=UPLOAD_CHUNK_SIZE)
+                release_database(db_path)
+                os.replace(tmp_path, db_path)
+                for cached in (
+                    db_exists,
+                    init_schema,
+                    get_session_factory,
+                    session_state_engine,
+                    _load_categories,
+                ):
+                    cached.clear()
+                for cached in (compile_sql, _expenses_query):
+                    cached.cache_clear()
+                bump_all_catalog_generations()
                 st.success("Database uploaded successfully.")
             except Exception as e:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
                 st.error(f"An error occurred: {e}")
         else:
             st.error("Incorrect DB File Name. Please upload the correct file.")
@@ -31,3 +56,19 @@ def upload_db(db_file_name: str) -> None:
         st.warning("No file uploaded. Existing database remains unchanged.")
     else:
         st.error("No database exists and no file uploaded.")
+
+
+def release_database(db_path: str) -> None:
+    """
+    Closes the pooled connections of the cached engines and removes the WAL sidecar files,
+    so nothing keeps reading the replaced file or replays its WAL onto the new one.
+
+    Args:
+        db_path (str): Absolute path to the database file about to be replaced.
+    """
+    get_session_factory().kw["bind"].dispose()
+    session_state_engine().dispose()
+    for suffix in SQLITE_SIDECAR_SUFFIXES:
+        sidecar_path = f"{db_path}{suffix}"
+        if os.path.exists(sidecar_path):
+            os.remove(sidecar_path)
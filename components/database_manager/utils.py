@@ -1,7 +1,31 @@
 # components/database_manager/utils.py
 import os
+from functools import lru_cache
+from typing import Optional
 
+import streamlit as st
+from dotenv import load_dotenv
 
+
+@lru_cache(maxsize=None)
+def get_env_variable(name: str) -> Optional[str]:
+    """
+    Reads an environment variable, loading the project's .env file the first time it is needed.
+
+    Args:
+        name (str): Name of the environment variable.
+
+    Returns:
+        Optional[str]: The variable value or None if it is not set.
+    """
+    load_dotenv()
+    return os.getenv(name)
+
+
+DB_NAME = get_env_variable("DB_NAME")
+
+
+@lru_cache(maxsize=1)
 def get_project_root() -> str:
     """
     Finds and returns the absolute path to the project's root directory, 'streamlit_personal_finance'.
@@ -18,6 +42,7 @@ def get_project_root() -> str:
         current_dir = parent_dir
 
 
+@st.cache_data(ttl=5)
 def db_exists(db_file_name: str) -> bool:
     """
     Checks if the specified database file exists in the project root directory.
@@ -28,10 +53,6 @@ def db_exists(db_file_name: str) -> bool:
     Returns:
         bool: True if the database file exists, False otherwise.
     """
-    project_root_dir = get_project_root()
-    db_files = [
-        f
-        for f in os.listdir(project_root_dir)
-        if f.endswith(".db") and f == db_file_name
-    ]
-    return bool(db_files)
+    if not db_file_name or not db_file_name.endswith(".db"):
+        return False
+    return os.path.isfile(os.path.join(get_project_root(), db_file_name))
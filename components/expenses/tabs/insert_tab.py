@@ -4,12 +4,14 @@ from typing import Type
 
 import pandas as pd
 import streamlit as st
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 from db.base_class import Base
-from db.crud import create, get_all, get_by_field
-from db.database import SessionLocal
+from db.crud import create, create_many
+from db.database import get_session_factory
 from db.schemas_tables import (
     ExpenseCategory,
     ExpenseSubcategory,
@@ -18,6 +20,51 @@ from db.schemas_tables import (
     PaymentMethod,
 )
 
+CATALOG_NAME_COLUMNS = {
+    "category_name": (ExpenseCategory, "category_id"),
+    "subcategory_name": (ExpenseSubcategory, "subcategory_id"),
+    "payment_method_name": (PaymentMethod, "payment_method_id"),
+    "expense_type_name": (ExpenseType, "expense_type_id"),
+}
+TRANSACTION_COLUMNS = [
+    "date",
+    "category_id",
+    "subcategory_id",
+    "payment_method_id",
+    "expense_type_id",
+    "vendor",
+    "location",
+    "description",
+    "amount",
+    "invoice_flag",
+    "notes",
+]
+# Columns the database rejects as NULL, plus the date every view filters on; rows missing
+# any of them, or holding a value that cannot be read, are reported, not inserted.
+REQUIRED_TRANSACTION_COLUMNS = ["date"] + [
+    column.name
+    for column in ExpenseTransaction.__table__.columns
+    if column.name in TRANSACTION_COLUMNS
+    and not column.nullable
+    and column.default is None
+]
+CSV_DTYPES = {
+    "category_name": "string[pyarrow]",
+    "subcategory_name": "string[pyarrow]",
+    "payment_method_name": "string[pyarrow]",
+    "expense_type_name": "string[pyarrow]",
+    "vendor": "string[pyarrow]",
+    "location": "string[pyarrow]",
+    "description": "string[pyarrow]",
+    "amount": "string[pyarrow]",
+    "invoice_flag": "string[pyarrow]",
+    "notes": "string[pyarrow]",
+}
+CSV_COLUMNS = ["date", *CSV_DTYPES]
+OPTIONS_MODELS = {
+    model.__name__: model for model in (ExpenseCategory, PaymentMethod, ExpenseType)
+}
+
 
 def expenses_insert_tab() -> None:
     """
@@ -34,13 +81,19 @@ def insert_expenses_ui() -> None:
     """
     Handles the user interface and logic for inserting new expense transactions.
     """
-    with SessionLocal() as session:
-        category_options = get_select_options(session, ExpenseCategory)
-        payment_method_options = get_select_options(session, PaymentMethod)
-        expense_type_options = get_select_options(session, ExpenseType)
+    if st.button("Refresh options"):
+        _select_options.clear()
+        _subcategory_options.clear()
+        st.session_state.pop("subcategory_options", None)
+
+    category_options = _select_options(ExpenseCategory.__name__)
+    payment_method_options = _select_options(PaymentMethod.__name__)
+    expense_type_options = _select_options(ExpenseType.__name__)
 
+    session_factory = get_session_factory()
+    with session_factory() as session:
         selected_category_id, selected_subcategory_id, date = expense_details_input(
-            session, category_options
+            category_options
         )
         payment_method_id, expense_type_id, invoice_requested = payment_details_input(
             payment_method_options, expense_type_options
@@ -71,14 +124,11 @@ def insert_expenses_ui() -> None:
             st.success("Expense transaction added successfully.")
 
 
-def expense_details_input(
-    session: Session, category_options: dict
-) -> tuple[int, int, datetime]:
+def expense_details_input(category_options: dict) -> tuple[int, int, datetime]:
     """
     Creates input widgets for expense details such as category, subcategory, and date.
 
     Args:
-        session (Session): The database session.
         category_options (dict): Dictionary of category options.
 
     Returns:
@@ -88,7 +138,7 @@ def expense_details_input(
     with col1:
         selected_category_id = category_select_ui(category_options)
     with col2:
-        subcategory_options = get_subcategory_options(session, selected_category_id)
+        subcategory_options = session_subcategory_options(selected_category_id)
         selected_subcategory_id = subcategory_select_ui(subcategory_options)
     with col3:
         date = date_ui()
@@ -208,16 +258,28 @@ def process_uploaded_file(uploaded_file: UploadedFile) -> None:
     Args:
         uploaded_file (UploadedFile): The uploaded CSV file.
     """
-    df = pd.read_csv(uploaded_file)
-    if df is not None:
-        with SessionLocal() as session:
-            results = create_expense_transactions_from_file(session, df)
-            display_upload_results(results)
+    # The pyarrow reader already infers ISO dates; the date column is converted while
+    # preparing the rows, so a file without it is reported instead of failing here.
+    try:
+        df = pd.read_csv(
+            uploaded_file,
+            engine="pyarrow",
+            dtype_backend="pyarrow",
+            dtype=CSV_DTYPES,
+        )
+    except Exception as e:
+        st.error(f"Error reading the CSV file: {e}")
+        return
+
+    session_factory = get_session_factory()
+    with session_factory() as session:
+        results = create_expense_transactions_from_file(session, df)
+        display_upload_results(results)
 
 
 def create_expense_transactions_from_file(session: Session, df: pd.DataFrame) -> dict:
     """
-    Creates expense transactions from a DataFrame.
+    Creates expense transactions from a DataFrame with a single bulk insert.
 
     Args:
         session (Session): The database session.
@@ -227,14 +289,41 @@ def create_expense_transactions_from_file(session: Session, df: pd.DataFrame) ->
         dict: Dictionary with counts of successful and failed transaction insertions.
     """
     results = {"success": 0, "failed": 0}
-    for _, row in df.iterrows():
-        try:
-            data = prepare_transaction_data(session, row)
-            create(session, ExpenseTransaction, data)
-            results["success"] += 1
-        except Exception as e:
-            st.error(f"Error in row {_}: {e}")
-            results["failed"] += 1
+    missing_columns = [column for column in CSV_COLUMNS if column not in df.columns]
+    if missing_columns:
+        st.error(f"Missing columns in the file: {', '.join(missing_columns)}.")
+        results["failed"] = len(df)
+        return results
+
+    transactions = prepare_transactions_data(session, df)
+
+    missing = transactions[REQUIRED_TRANSACTION_COLUMNS].isna()
+    valid_rows = ~missing.any(axis=1)
+    for row_index in transactions.index[~valid_rows]:
+        missing_columns = ", ".join(missing.columns[missing.loc[row_index]])
+        st.error(f"Error in row {row_index}: missing {missing_columns}.")
+    results["failed"] = int((~valid_rows).sum())
+
+    valid_transactions = transactions.loc[valid_rows, TRANSACTION_COLUMNS]
+    records = valid_transactions.astype(object).where(valid_transactions.notna(), None)
+    try:
+        create_many(session, ExpenseTransaction, records.to_dict("records"))
+        results["success"] = len(records)
+    except IntegrityError:
+        # Fall back to one insert per row so a single bad row does not fail the rest.
+        session.rollback()
+        for row_index, record in zip(records.index, records.to_dict("records")):
+            try:
+                create(session, ExpenseTransaction, record)
+                results["success"] += 1
+            except Exception as e:
+                session.rollback()
+                st.error(f"Error in row {row_index}: {e}")
+                results["failed"] += 1
+    except Exception as e:
+        session.rollback()
+        st.error(f"Error inserting transactions: {e}")
+        results["failed"] += len(records)
     return results
 
 
@@ -249,38 +338,26 @@ def display_upload_results(results: dict) -> None:
     st.error(f"Failed: {results['failed']} transactions.")
 
 
-def prepare_transaction_data(session: Session, row: pd.Series) -> dict:
+def prepare_transactions_data(session: Session, df: pd.DataFrame) -> pd.DataFrame:
     """
-    Prepares the transaction data from a row in DataFrame.
+    Prepares the transactions data from the uploaded DataFrame, resolving catalog names to IDs.
 
     Args:
         session (Session): The database session.
-        row (pd.Series): A series representing a row in the DataFrame.
+        df (pd.DataFrame): DataFrame containing expense transaction data.
 
     Returns:
-        dict: A dictionary of transaction data ready to be inserted into the database.
+        pd.DataFrame: DataFrame with the transaction columns ready to be inserted into the database.
     """
-    category_id = get_id_for_name(session, ExpenseCategory, row["category_name"])
-    subcategory_id = get_id_for_name(
-        session, ExpenseSubcategory, row["subcategory_name"]
-    )
-    payment_method_id = get_id_for_name(
-        session, PaymentMethod, row["payment_method_name"]
-    )
-    expense_type_id = get_id_for_name(session, ExpenseType, row["expense_type_name"])
-    return {
-        "date": pd.to_datetime(row["date"]).date(),
-        "category_id": category_id,
-        "subcategory_id": subcategory_id,
-        "payment_method_id": payment_method_id,
-        "expense_type_id": expense_type_id,
-        "vendor": row["vendor"],
-        "location": row["location"],
-        "description": row["description"],
-        "amount": float(row["amount"]),
-        "invoice_flag": row["invoice_flag"] == "True",
-        "notes": row["notes"],
-    }
+    for name_column, (model, id_column) in CATALOG_NAME_COLUMNS.items():
+        name_map = _name_to_id_map(session, model)
+        df[id_column] = df[name_column].map(name_map).astype("Int64")
+
+    # Unreadable dates and amounts become missing values, reported with the row.
+    df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.date
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce").astype(float)
+    df["invoice_flag"] = df["invoice_flag"].astype(str).eq("True")
+    return df
 
 
 def get_select_options(session: Session, model: Type[Base]) -> dict:
@@ -295,8 +372,7 @@ def get_select_options(session: Session, model: Type[Base]) -> dict:
         dict: Dictionary of ID to name mappings for the given model.
     """
 
-    records = get_all(session, model)
-    return {record.id: record.name for record in records}
+    return dict(session.execute(select(model.id, model.name)).all())
 
 
 def get_subcategory_options(session: Session, category_id: int) -> dict:
@@ -310,10 +386,63 @@ def get_subcategory_options(session: Session, category_id: int) -> dict:
     Returns:
         dict: Dictionary of subcategory ID to name mappings.
     """
-    subcategories = get_by_field(
-        session, ExpenseSubcategory, "category_id", category_id
+    subcategories_query = select(ExpenseSubcategory.id, ExpenseSubcategory.name).where(
+        ExpenseSubcategory.category_id == category_id
     )
-    return {sc.id: sc.name for sc in subcategories}
+    return dict(session.execute(subcategories_query).all())
+
+
+@st.cache_data(ttl=300)
+def _select_options(model_name: str) -> dict:
+    """
+    Loads and caches the select box options of a catalog model.
+
+    Args:
+        model_name (str): Name of the catalog model class, used as the cache key.
+
+    Returns:
+        dict: Dictionary of ID to name mappings for the given model.
+    """
+    session_factory = get_session_factory()
+    with session_factory() as session:
+        return get_select_options(session, OPTIONS_MODELS[model_name])
+
+
+@st.cache_data(ttl=600)
+def _subcategory_options(category_id: int) -> dict:
+    """
+    Loads and caches the subcategory options of a category.
+
+    Args:
+        category_id (int): ID of the selected category.
+
+    Returns:
+        dict: Dictionary of subcategory ID to name mappings.
+    """
+    session_factory = get_session_factory()
+    with session_factory() as session:
+        return get_subcategory_options(session, category_id)
+
+
+def session_subcategory_options(category_id: int) -> dict:
+    """
+    Returns the subcategory options of a category, keeping the last resolved options in the
+    session state so they are only looked up again when the selected category changes.
+
+    Args:
+        category_id (int): ID of the selected category.
+
+    Returns:
+        dict: Dictionary of subcategory ID to name mappings.
+    """
+    cached = st.session_state.get("subcategory_options")
+    if cached is None or cached["category_id"] != category_id:
+        cached = {
+            "category_id": category_id,
+            "options": _subcategory_options(category_id),
+        }
+        st.session_state["subcategory_options"] = cached
+    return cached["options"]
 
 
 def category_select_ui(category_options: dict) -> int:
@@ -349,6 +478,7 @@ def subcategory_select_ui(subcategory_options: dict) -> int:
         "SubCategory",
         list(subcategory_options.keys()),
         format_func=lambda x: subcategory_options[x],
+        key="subcategory_select",
     )
     return selected_subcategory_id
 
@@ -377,17 +507,17 @@ def select_ui(title: str, options: dict) -> int:
     return st.selectbox(title, list(options.keys()), format_func=lambda x: options[x])
 
 
-def get_id_for_name(session: Session, model: Type[Base], name: str) -> int:
+def _name_to_id_map(session: Session, model: Type[Base]) -> dict[str, int]:
     """
-    Fetches the ID corresponding to the given name from the specified model.
+    Builds a name to ID lookup for every record of the specified model.
 
     Args:
         session (Session): The database session.
         model (Type[Base]): The SQLAlchemy model class.
-        name (str): Name whose ID is to be fetched.
 
     Returns:
-        int: ID of the record with the given name.
+        dict[str, int]: Mapping of record names to IDs, keeping the lowest ID for repeated names.
     """
-    record = session.query(model).filter(model.name == name).first()
-    return record.id if record else None
+    return dict(
+        session.execute(select(model.name, model.id).order_by(model.id.desc())).all()
+    )
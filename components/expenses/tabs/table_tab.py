@@ -1,51 +1,180 @@
-from typing import Dict, List, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 import streamlit as st
 
 from components.table_generator import (
-    apply_filters,
-    display_table,
+    display_table_page,
     prepare_data,
     render_filters,
+    render_pagination,
 )
-from db.database import SessionLocal
-from db.schemas_tables import (
-    ExpenseCategory,
-    ExpenseSubcategory,
-    ExpenseType,
-    PaymentMethod,
-)
+from db.database import SessionLocal, get_session_factory
 from formatters.formatter import CategoryListFormatter, ExpenseDataFrameFormatter
 from queries.category import QueryCategory
 from queries.expenses import QueryExpenses
 
+# Amounts stay in double precision so cents survive on large values; a page whose taxes
+# are all missing still gets a numeric column. Text columns are packed into Arrow string
+# buffers, which st.dataframe also serializes without converting Python objects.
+EXPENSE_DTYPES: Dict[str, str] = {
+    "amount": "float64",
+    "tax": "float64",
+    **dict.fromkeys(
+        [
+            "category_id",
+            "subcategory_id",
+            "expense_type_id",
+            "payment_method_id",
+            "vendor",
+            "location",
+            "description",
+            "notes",
+        ],
+        "string[pyarrow]",
+    ),
+}
+
 
 def expenses_table_tab() -> None:
     """
     Renders tabs in the Streamlit app to display tables of expenses and summary pivot tables,
     with options to filter by a specific year and month, including pagination.
     """
-    session_factory = SessionLocal
-    catalogs: Dict[str, Type] = {
-        "payment_method_id": PaymentMethod,
-        "expense_type_id": ExpenseType,
-        "category_id": ExpenseCategory,
-        "subcategory_id": ExpenseSubcategory,
-    }
+    session_factory = get_session_factory()
     formatter_expenses = ExpenseDataFrameFormatter()
     query_expenses = QueryExpenses(session_factory, formatter_expenses)
 
-    expenses_data = prepare_data(session_factory, query_expenses, ["date"], catalogs)
+    version = query_expenses.fetch_version()
     filters, (col3, col4) = render_filters(
         session_factory,
-        expenses_data,
-        "date",
+        _load_expense_years(session_factory, version),
         {"category_filter": render_category_filter},
     )
-    filtered_data = apply_filters(expenses_data, filters, "date")
-    display_table(filtered_data, "expenses", col3, col4)
-    display_pivot_tables(filtered_data)
+    query_filters = (
+        None if filters["year"] == "All" else filters["year"],
+        None if filters["month"] == "All" else filters["month"],
+        tuple(sorted(filters["category_filter"])),
+    )
+    total_rows = _count_expenses(session_factory, version, *query_filters)
+    start_row, page_size = render_pagination(total_rows, col3, col4)
+    page_data = _load_expenses_page(
+        session_factory, version, *query_filters, page_size, start_row
+    )
+    display_table_page(page_data, "expenses")
+    display_pivot_tables(
+        *_load_expense_pivots(session_factory, version, *query_filters)
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_expense_years(
+    _session_factory: Callable[..., SessionLocal], version: Tuple[Any, ...]
+) -> List[int]:
+    """
+    Fetches the years with expenses, caching the result until the expenses version changes.
+
+    Args:
+        _session_factory: A factory function to create new database sessions (not hashed).
+        version: Version token of the expenses table, used as the cache key.
+
+    Returns:
+        A list of years, most recent first.
+    """
+    return QueryExpenses(_session_factory, ExpenseDataFrameFormatter()).fetch_years()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _count_expenses(
+    _session_factory: Callable[..., SessionLocal],
+    version: Tuple[Any, ...],
+    year: Optional[int],
+    month: Optional[int],
+    categories: Tuple[str, ...],
+) -> int:
+    """
+    Counts the expenses matching the filters, caching the result per filter combination
+    until the expenses version changes.
+
+    Args:
+        _session_factory: A factory function to create new database sessions (not hashed).
+        version: Version token of the expenses table, used as part of the cache key.
+        year: Year to filter by, or None for every year.
+        month: Month number to filter by, or None for every month.
+        categories: Sorted category names to keep.
+
+    Returns:
+        The number of matching expenses.
+    """
+    query_expenses = QueryExpenses(_session_factory, ExpenseDataFrameFormatter())
+    return query_expenses.fetch_count(year, month, list(categories))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_expenses_page(
+    _session_factory: Callable[..., SessionLocal],
+    version: Tuple[Any, ...],
+    year: Optional[int],
+    month: Optional[int],
+    categories: Tuple[str, ...],
+    limit: int,
+    offset: int,
+) -> pd.DataFrame:
+    """
+    Fetches one page of the expenses matching the filters, with catalog names joined in
+    the query, caching the result per filter combination and page until the expenses
+    version changes.
+
+    Args:
+        _session_factory: A factory function to create new database sessions (not hashed).
+        version: Version token of the expenses table, used as part of the cache key.
+        year: Year to filter by, or None for every year.
+        month: Month number to filter by, or None for every month.
+        categories: Sorted category names to keep.
+        limit: Number of rows per page.
+        offset: Number of rows before the page.
+
+    Returns:
+        A DataFrame with the prepared expenses of the page.
+    """
+    query_expenses = QueryExpenses(_session_factory, ExpenseDataFrameFormatter())
+    query_filters = {
+        "year": year,
+        "month": month,
+        "categories": list(categories),
+        "limit": limit,
+        "offset": offset,
+    }
+    return prepare_data(query_expenses, ["date"], query_filters, EXPENSE_DTYPES)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_expense_pivots(
+    _session_factory: Callable[..., SessionLocal],
+    version: Tuple[Any, ...],
+    year: Optional[int],
+    month: Optional[int],
+    categories: Tuple[str, ...],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Builds the summary pivot tables from the per category and subcategory totals summed
+    in the database, caching them per filter combination until the expenses version
+    changes, so moving between table pages skips the aggregation entirely.
+
+    Args:
+        _session_factory: A factory function to create new database sessions (not hashed).
+        version: Version token of the expenses table, used as part of the cache key.
+        year: Year to filter by, or None for every year.
+        month: Month number to filter by, or None for every month.
+        categories: Sorted category names to keep.
+
+    Returns:
+        The pivot tables by category and by category/subcategory.
+    """
+    query_expenses = QueryExpenses(_session_factory, ExpenseDataFrameFormatter())
+    return create_pivot_tables(
+        query_expenses.fetch_totals(year, month, list(categories))
+    )
 
 
 def render_category_filter(session_factory: SessionLocal) -> List[str]:
@@ -58,9 +187,7 @@ def render_category_filter(session_factory: SessionLocal) -> List[str]:
     Returns:
         A list of selected category names.
     """
-    formatter_category = CategoryListFormatter()
-    query_category = QueryCategory(session_factory, formatter_category)
-    categories_names = query_category.execute_query()
+    categories_names = _category_options(session_factory)
     with st.expander("Categories Filters:"):
         selected_categories = st.multiselect(
             "Available Categories",
@@ -72,18 +199,51 @@ def render_category_filter(session_factory: SessionLocal) -> List[str]:
     return selected_categories
 
 
-def display_pivot_tables(df: pd.DataFrame) -> None:
+@st.cache_data(ttl=300, show_spinner=False)
+def _category_options(_session_factory: Callable[..., SessionLocal]) -> List[str]:
     """
-    Generates and displays summary pivot tables in the Streamlit app.
+    Fetches and caches the category names offered by the category filter.
 
     Args:
-        df (pd.DataFrame): DataFrame containing expense data for pivot tables.
+        _session_factory: A factory function to create new database sessions (not hashed).
+
+    Returns:
+        A list of category names ordered by ID.
+    """
+    return QueryCategory(_session_factory, CategoryListFormatter()).execute_query()
+
+
+def create_pivot_tables(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
-    pivot_category = create_pivot_table(df, ["category_id"])
+    Generates the summary pivot tables by category and by category/subcategory.
+
+    Args:
+        df (pd.DataFrame): Expense amounts per category and subcategory, either raw rows
+            or totals already summed by the database.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The pivot tables by category and by
+            category/subcategory.
+    """
+    # Aggregate once at the finest level; the category totals are derived from
+    # that small result instead of scanning the expenses again.
     pivot_category_subcategory = create_pivot_table(
         df, ["category_id", "subcategory_id"]
     )
+    pivot_category = create_pivot_table(pivot_category_subcategory, ["category_id"])
+    return pivot_category, pivot_category_subcategory
+
+
+def display_pivot_tables(
+    pivot_category: pd.DataFrame, pivot_category_subcategory: pd.DataFrame
+) -> None:
+    """
+    Displays the summary pivot tables in the Streamlit app.
 
+    Args:
+        pivot_category (pd.DataFrame): Pivot table by category.
+        pivot_category_subcategory (pd.DataFrame): Pivot table by category/subcategory.
+    """
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Summary by Category")
@@ -106,9 +266,21 @@ def create_pivot_table(df: pd.DataFrame, group_by: List[str]) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Generated pivot table.
     """
-    df = df.copy()
-    df[group_by] = df[group_by].fillna("Unspecified")
-    return df.groupby(group_by)["amount"].sum().reset_index().sort_values(by=group_by)
+    keys = [_fill_unspecified(df[column]) for column in group_by]
+    return df["amount"].groupby(keys, observed=True).sum().reset_index()
+
+
+def _fill_unspecified(series: pd.Series) -> pd.Series:
+    """
+    Labels missing values as 'Unspecified'.
+
+    Args:
+        series (pd.Series): Group-by column.
+
+    Returns:
+        pd.Series: The column without missing values.
+    """
+    return series.fillna("Unspecified")
 
 
 def display_pivot_table(pivot_df: pd.DataFrame, columns: List[str]) -> None:
@@ -1,5 +1,6 @@
 # backend/helpers/table_generator.py
-from typing import Any, Callable, Dict, Optional, Tuple, Type
+import calendar
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 import streamlit as st
@@ -9,59 +10,41 @@ from components.incomes.display_table import display_payroll_table
 from db.database import SessionLocal
 from queries.query import Query
 
+MONTH_OPTIONS: List[Any] = ["All"] + list(range(1, 13))
+# calendar.month_name formats the name on every lookup, so resolve the labels once.
+_MONTH_NAMES: List[str] = ["All"] + list(calendar.month_name)[1:]
+
 
 def prepare_data(
-    session_factory: Callable[..., SessionLocal],
     query_object: Query,
     date_columns: list[str],
-    catalogs: Dict[str, Type],
+    query_filters: Optional[Dict[str, Any]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
 ) -> pd.DataFrame:
     """
-    Prepares data by executing a database query, converting specified columns to datetime,
-    and replacing IDs with names from catalog tables.
+    Prepares data by executing a database query, converting specified columns to datetime
+    and downcasting numeric columns.
 
     Args:
-        session_factory: A factory function to create new database sessions.
         query_object: An object representing a database query.
         date_columns: List of column names to be converted to datetime.
-        catalogs: Dictionary mapping column names to SQLAlchemy model classes.
+        query_filters: Keyword filters pushed down to the query, if any.
+        dtypes: Narrower dtypes to cast columns to, if any.
 
     Returns:
         A pandas DataFrame with processed data.
     """
-    data = query_object.execute_query()
-    data[date_columns] = data[date_columns].apply(pd.to_datetime)
-    return replace_ids_with_catalog_names(session_factory, data, catalogs)
-
-
-def replace_ids_with_catalog_names(
-    session_factory: Callable[..., SessionLocal],
-    df: pd.DataFrame,
-    catalogs: Dict[str, Type],
-) -> pd.DataFrame:
-    """
-    Replaces ID values in specified columns with corresponding names from catalog tables.
-
-    Args:
-        session_factory: A factory function to create new database sessions.
-        df: DataFrame containing data with IDs to replace.
-        catalogs: Dictionary mapping column names to SQLAlchemy model classes.
-
-    Returns:
-        A DataFrame with IDs replaced by names.
-    """
-    with session_factory() as session:
-        for id_column, model in catalogs.items():
-            catalog_df = pd.read_sql(session.query(model).statement, session.bind)
-            name_map = dict(zip(catalog_df["id"], catalog_df["name"]))
-            df[id_column] = df[id_column].map(name_map).fillna(df[id_column])
-    return df
+    data = query_object.execute_query(**(query_filters or {}))
+    for column in date_columns:
+        data[column] = pd.to_datetime(data[column])
+    if dtypes:
+        data = data.astype(dtypes, copy=False)
+    return data
 
 
 def render_filters(
     session_factory: Callable[..., SessionLocal],
-    data: pd.DataFrame,
-    date_column: str,
+    year_options: List[int],
     additional_filters: Optional[Dict[str, Callable[[SessionLocal], Any]]] = None,
 ) -> Tuple[Dict[str, Any], Tuple[st.columns, st.columns]]:
     """
@@ -69,8 +52,7 @@ def render_filters(
 
     Args:
         session_factory: A factory function to create new database sessions.
-        data: DataFrame containing the data to be filtered.
-        date_column: Name of the column containing date information.
+        year_options: Years available for filtering, most recent first.
         additional_filters: Dictionary of additional filter functions, if any.
 
     Returns:
@@ -78,8 +60,7 @@ def render_filters(
     """
     filters = {}
 
-    years = ["All"] + sorted(data[date_column].dt.year.unique(), reverse=True)
-    months = ["All"] + list(range(1, 13))
+    years = ["All"] + list(year_options)
 
     col1, col2, col3, col4 = st.columns([0.2, 0.3, 0.3, 0.2])
     with col1:
@@ -93,11 +74,9 @@ def render_filters(
     with col2:
         selected_month = st.selectbox(
             "Select Month",
-            months,
+            MONTH_OPTIONS,
             index=0,
-            format_func=lambda x: "All"
-            if x == "All"
-            else pd.to_datetime(f"1900-{x}-01").strftime("%B"),
+            format_func=lambda x: "All" if x == "All" else _MONTH_NAMES[x],
             key="selected_month",
         )
 
@@ -111,47 +90,23 @@ def render_filters(
     return filters, (col3, col4)
 
 
-def apply_filters(
-    data: pd.DataFrame, filters: Dict[str, Any], date_column: str
-) -> pd.DataFrame:
-    """
-    Applies the specified filters to the DataFrame.
-
-    Args:
-        data: DataFrame to be filtered.
-        filters: Dictionary of filters to apply.
-        date_column: Name of the column containing date information.
-
-    Returns:
-        A filtered DataFrame.
-    """
-    if filters["year"] != "All":
-        data = data[data[date_column].dt.year == filters["year"]]
-    if filters["month"] != "All":
-        data = data[data[date_column].dt.month == filters["month"]]
-    if "category_filter" in filters:
-        data = data[data["category_id"].isin(filters["category_filter"])]
-
-    return data
-
-
-def display_table(
-    data: pd.DataFrame,
-    table_type: str,
+def render_pagination(
+    total_rows: int,
     col3: st.delta_generator.DeltaGenerator,
     col4: st.delta_generator.DeltaGenerator,
-) -> None:
+) -> Tuple[int, int]:
     """
-    Displays a table with pagination in the Streamlit app.
+    Renders the pagination controls in the Streamlit app.
 
     Args:
-        data: Data to display in the table.
-        table_type: Type of the table (e.g., 'expenses', 'payroll').
+        total_rows: Total number of rows to paginate.
         col3: Streamlit column for pagination controls.
         col4: Streamlit column for pagination details.
+
+    Returns:
+        A tuple with the first row of the selected page and the page size.
     """
     page_size = int(st.session_state.get("page_size", 10))
-    total_rows = len(data)
     num_pages = (total_rows // page_size) + (1 if total_rows % page_size > 0 else 0)
 
     with col3:
@@ -168,11 +123,18 @@ def display_table(
             unsafe_allow_html=True,
         )
 
-    start_row = (selected_page - 1) * page_size
-    end_row = start_row + page_size
-    paginated_data = data.iloc[start_row:end_row]
+    return (selected_page - 1) * page_size, page_size
+
+
+def display_table_page(data: pd.DataFrame, table_type: str) -> None:
+    """
+    Displays an already paginated table in the Streamlit app.
 
+    Args:
+        data: Rows of the selected page.
+        table_type: Type of the table (e.g., 'expenses', 'payroll').
+    """
     if table_type == "expenses":
-        display_expenses_table(paginated_data)
+        display_expenses_table(data)
     else:
         st.error(f"Unsupported table type: {table_type}")
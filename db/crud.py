@@ -1,20 +1,52 @@
 # db/crud.py
+import warnings
+from functools import lru_cache
 from typing import Any, List, Optional, Type, TypeVar
 
+from sqlalchemy import delete as delete_stmt
 from sqlalchemy import inspect
+from sqlalchemy import update as update_stmt
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import sqltypes
 
 from db.base_class import Base
+from db.queries import bump_catalog_generation
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
 def get_all(
+    db: Session,
+    model: Type[ModelType],
+    after_id: Optional[int] = None,
+    limit: int = 100,
+) -> list[ModelType]:
+    """
+    Retrieve a page of records from the database, ordered by ID.
+
+    Pages are addressed with a keyset cursor: pass the ID of the last record of the previous
+    page as after_id to get the next one. The primary key index is used to seek straight to
+    the page instead of scanning and discarding the preceding rows.
+
+    :param db: Database session.
+    :param model: SQLAlchemy model class.
+    :param after_id: ID of the last record of the previous page, or None for the first page.
+    :param limit: Maximum number of records to return.
+    :return: List of model instances.
+    """
+    query = db.query(model).order_by(model.id)
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+    return query.limit(limit).all()
+
+
+def get_all_offset(
     db: Session, model: Type[ModelType], skip: int = 0, limit: int = 100
 ) -> list[ModelType]:
     """
-    Retrieve a list of records from the database.
+    Retrieve a list of records from the database using OFFSET pagination.
+
+    Deprecated: use get_all with after_id instead.
 
     :param db: Database session.
     :param model: SQLAlchemy model class.
@@ -22,7 +54,12 @@ def get_all(
     :param limit: Maximum number of records to return.
     :return: List of model instances.
     """
-    return db.query(model).offset(skip).limit(limit).all()
+    warnings.warn(
+        "get_all_offset is deprecated, use get_all with after_id instead.",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    return db.query(model).order_by(model.id).offset(skip).limit(limit).all()
 
 
 def get_by_field(
@@ -30,20 +67,39 @@ def get_by_field(
     model: Type[ModelType],
     field_name: str,
     field_value: Any,
-    skip: int = 0,
+    after_id: Optional[int] = None,
     limit: int = 100,
 ) -> List[ModelType]:
     """
-    Retrieve records from the database based on a specific field's value.
+    Retrieve a page of records from the database based on a specific field's value,
+    ordered by ID.
 
     :param db: Database session.
     :param model: SQLAlchemy model class.
     :param field_name: Name of the field to filter by.
     :param field_value: Value of the field to filter by.
-    :param skip: Number of records to skip (for pagination).
+    :param after_id: ID of the last record of the previous page, or None for the first page.
     :param limit: Maximum number of records to return.
     :return: List of model instances matching the field criteria.
     """
+    column = _resolve_column(model, field_name)
+    query = db.query(model).filter(column == field_value).order_by(model.id)
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+    return query.limit(limit).all()
+
+
+@lru_cache(maxsize=256)
+def _resolve_column(model: Type[ModelType], field_name: str) -> Any:
+    """
+    Resolve a model attribute to its column, memoized per model and field name.
+
+    :param model: SQLAlchemy model class.
+    :param field_name: Name of the field to resolve.
+    :return: The instrumented column attribute.
+    :raises ValueError: If the model has no such field.
+    :raises TypeError: If the field is not a column.
+    """
     mapper = inspect(model)
     if field_name not in mapper.attrs:
         raise ValueError(f"Field '{field_name}' not found in model '{model.__name__}'.")
@@ -51,8 +107,7 @@ def get_by_field(
     column = getattr(model, field_name)
     if not isinstance(column.expression.type, sqltypes.TypeEngine):
         raise TypeError(f"Field '{field_name}' is not a valid SQLAlchemy column.")
-
-    return db.query(model).filter(column == field_value).offset(skip).limit(limit).all()
+    return column
 
 
 def create(db: Session, model: Type[ModelType], obj_in: dict) -> ModelType:
@@ -67,10 +122,26 @@ def create(db: Session, model: Type[ModelType], obj_in: dict) -> ModelType:
     obj = model(**obj_in)
     db.add(obj)
     db.commit()
+    bump_catalog_generation(model.__name__)
     db.refresh(obj)
     return obj
 
 
+def create_many(db: Session, model: Type[ModelType], objs_in: List[dict]) -> None:
+    """
+    Create many records in the database with a single executemany and one commit.
+
+    :param db: Database session.
+    :param model: SQLAlchemy model class.
+    :param objs_in: List of dictionaries containing the data for the new records.
+    """
+    if not objs_in:
+        return
+    db.bulk_insert_mappings(model, objs_in)
+    db.commit()
+    bump_catalog_generation(model.__name__)
+
+
 def update(
     db: Session, model: Type[ModelType], obj_id: Any, obj_in: dict
 ) -> Optional[ModelType]:
@@ -83,14 +154,16 @@ def update(
     :param obj_in: Dictionary containing fields to update.
     :return: The updated model instance or None if not found.
     """
-    obj = db.query(model).filter(model.id == obj_id).first()
-    if obj:
-        for var, value in obj_in.items():
-            setattr(obj, var, value) if value else None
-        db.commit()
-        db.refresh(obj)
-        return obj
-    return None
+    if not obj_in:
+        return db.get(model, obj_id)
+
+    stmt = update_stmt(model).where(model.id == obj_id).values(**obj_in)
+    obj = db.execute(stmt.returning(model)).scalar_one_or_none()
+    if obj is None:
+        return None
+    db.commit()
+    bump_catalog_generation(model.__name__)
+    return obj
 
 
 def delete(db: Session, model: Type[ModelType], obj_id: Any) -> Optional[ModelType]:
@@ -102,9 +175,12 @@ def delete(db: Session, model: Type[ModelType], obj_id: Any) -> Optional[ModelTy
     :param obj_id: ID of the object to delete.
     :return: The deleted model instance or None if not found.
     """
-    obj = db.query(model).get(obj_id)
-    if obj:
-        db.delete(obj)
-        db.commit()
-        return obj
-    return None
+    stmt = delete_stmt(model).where(model.id == obj_id).returning(model)
+    obj = db.execute(stmt).scalar_one_or_none()
+    if obj is None:
+        return None
+    # Detach the returned row so committing does not expire it.
+    db.expunge(obj)
+    db.commit()
+    bump_catalog_generation(model.__name__)
+    return obj
@@ -1,15 +1,122 @@
 # db/database.py
 import os
+from functools import lru_cache
+from typing import Any
 
-from sqlalchemy import create_engine
+import connectorx as cx
+import streamlit as st
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import Select
 
-from components.database_manager.utils import db_exists
+from components.database_manager.utils import db_exists, get_env_variable
 from db.base_class import Base
+from db.schemas_tables import ExpenseTransaction
 
-db_file_name = os.getenv("DB_NAME")
+# The page cache is private to each pooled connection, so it stays at a few MiB; reads
+# beyond it are served from the memory map, which every connection shares.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "cache_size=-8192",
+    "mmap_size=268435456",
+    "temp_store=MEMORY",
+)
+COMPILED_SQL_CACHE_SIZE = 256
+SQLITE_DIALECT = sqlite.dialect()
+
+
+@st.cache_resource
+def get_session_factory() -> sessionmaker:
+    """
+    Creates the database engine and its session factory once per process, so the engine
+    and its connection pool survive Streamlit reruns.
+
+    Returns:
+        sessionmaker: The session factory bound to the application database.
+    """
+    # Streamlit reruns open a session per query; keep enough pooled connections around
+    # so catalog and expenses lookups reuse them instead of reconnecting.
+    engine = create_engine(
+        f"sqlite:///{get_env_variable('DB_NAME')}",
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@st.cache_resource
+def init_schema() -> None:
+    """
+    Creates any missing table or index of the application database, once per process.
+    Call it from the app bootstrap before the first query.
+    """
+    if not db_exists(get_env_variable("DB_NAME")):
+        return
+    engine = get_session_factory().kw["bind"]
+    Base.metadata.create_all(engine)
+    # create_all skips tables that already exist, along with their new indexes.
+    for index in ExpenseTransaction.__table__.indexes:
+        index.create(engine, checkfirst=True)
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Tunes every new SQLite connection for the dashboard's read-heavy workload.
+
+    Args:
+        dbapi_connection: The raw DBAPI connection that was just opened.
+        connection_record: The pool record of the connection (unused).
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+def read_sql(query: Select, return_type: str = "pandas", **kwargs: Any) -> Any:
+    """
+    Runs a SELECT through connectorx, which decodes the result into Arrow buffers in bulk
+    instead of building Python objects row by row.
+
+    Args:
+        query (Select): The SQLAlchemy SELECT statement; bound values are inlined.
+        return_type (str): Result type accepted by connectorx ("pandas", "arrow", ...).
+        **kwargs: Extra connectorx options, such as batch_size for "arrow_stream".
+
+    Returns:
+        Any: The query result in the requested format.
+    """
+    return cx.read_sql(DB_URL, compile_sql(query), return_type=return_type, **kwargs)
+
+
+@lru_cache(maxsize=COMPILED_SQL_CACHE_SIZE)
+def compile_sql(query: Select) -> str:
+    """
+    Renders a SELECT as SQLite text with its bound values inlined. Inlined statements
+    bypass SQLAlchemy's compiled cache, so the rendered text is memoized per statement.
+
+    Args:
+        query (Select): The SQLAlchemy SELECT statement.
+
+    Returns:
+        str: The SQL text of the statement.
+    """
+    return str(
+        query.compile(dialect=SQLITE_DIALECT, compile_kwargs={"literal_binds": True})
+    )
+
+
+db_file_name = get_env_variable("DB_NAME")
 if db_exists(db_file_name):
     SQLALCHEMY_DATABASE_URL = f"sqlite:///{db_file_name}"
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(engine)
+    # connectorx only accepts absolute SQLite paths.
+    DB_URL = f"sqlite://{os.path.abspath(db_file_name)}"
+    SessionLocal = get_session_factory()
+    engine = SessionLocal.kw["bind"]
@@ -0,0 +1,42 @@
+from typing import Dict
+
+# Generation counters of the catalog tables. db.crud bumps them after every write, so the
+# cached catalog reads keyed on them are invalidated.
+CATALOG_GENERATIONS: Dict[str, int] = {
+    "ExpenseCategory": 0,
+    "ExpenseSubcategory": 0,
+    "Month": 0,
+}
+
+
+def catalog_generation(model_name: str) -> int:
+    """
+    Returns the current generation of a catalog table.
+
+    Args:
+        model_name (str): Name of the catalog model class.
+
+    Returns:
+        int: The generation counter, 0 for tables that are not tracked.
+    """
+    return CATALOG_GENERATIONS.get(model_name, 0)
+
+
+def bump_catalog_generation(model_name: str) -> None:
+    """
+    Invalidates the cached reads of a catalog table after it has been written to.
+
+    Args:
+        model_name (str): Name of the model class that was written to.
+    """
+    if model_name in CATALOG_GENERATIONS:
+        CATALOG_GENERATIONS[model_name] += 1
+
+
+def bump_all_catalog_generations() -> None:
+    """
+    Invalidates the cached reads of every catalog table, e.g. after the database file has
+    been replaced outside of db.crud.
+    """
+    for model_name in CATALOG_GENERATIONS:
+        CATALOG_GENERATIONS[model_name] += 1
@@ -1,28 +1,146 @@
+import os
+from functools import lru_cache
+from typing import Any, Iterator, Optional, Tuple
+
 import pandas as pd
-from sqlalchemy import desc
+import pyarrow as pa
+from sqlalchemy import desc, select
+from sqlalchemy.sql import Select
 
-from db.database import SessionLocal
+from db.database import SessionLocal, read_sql
 from db.schemas_tables import ExpenseTransaction
 
+EXPORT_QUERY = select(ExpenseTransaction)
+EXPENSE_SUMMARY_COLUMNS = (
+    ExpenseTransaction.id,
+    ExpenseTransaction.category_id,
+    ExpenseTransaction.subcategory_id,
+    ExpenseTransaction.amount,
+    ExpenseTransaction.date,
+    ExpenseTransaction.vendor,
+)
+
 
 def fetch_expenses_data(
-    session: SessionLocal, owner_id: int = 1, type_id: int = 1
-) -> pd.DataFrame:
+    session: Optional[SessionLocal] = None, owner_id: int = 1, type_id: int = 1
+) -> pa.Table:
     """
     Fetches expense transaction data from the database, filtered by owner and type, and sorted in descending order.
+    The result stays in Arrow format; convert it to pandas only where a DataFrame is needed.
+
+    Args:
+        session (Optional[SessionLocal]): Database session to read through pandas instead
+            of connectorx, if any.
+        owner_id (int): ID of the owner to filter the expenses. Default is 1.
+        type_id (int): ID of the expense type to filter. Default is 1.
+
+    Returns:
+        pa.Table: Arrow table containing the filtered and sorted expense transaction data.
+    """
+    expenses_query = _expenses_query(owner_id, type_id)
+    if session is not None:
+        expenses_df = pd.read_sql(expenses_query, session.connection())
+        return pa.Table.from_pandas(expenses_df, preserve_index=False)
+    return read_sql(expenses_query, return_type="arrow")
+
+
+def fetch_expenses_summary(
+    session: Optional[SessionLocal] = None, owner_id: int = 1, type_id: int = 1
+) -> pa.Table:
+    """
+    Fetches only the id, category, subcategory, amount, date and vendor of the expense
+    transactions of an owner and type, most recent first. Leaving out the free-text and
+    audit columns keeps the rows, and the Arrow buffers built from them, much narrower.
 
     Args:
-        session (SessionLocal): Database session for querying the data.
+        session (Optional[SessionLocal]): Database session to read through pandas instead
+            of connectorx, if any.
         owner_id (int): ID of the owner to filter the expenses. Default is 1.
         type_id (int): ID of the expense type to filter. Default is 1.
 
     Returns:
-        pd.DataFrame: DataFrame containing the filtered and sorted expense transaction data.
+        pa.Table: Arrow table containing the summary columns of the expense transactions.
+    """
+    summary_query = _expenses_query(owner_id, type_id, EXPENSE_SUMMARY_COLUMNS)
+    if session is not None:
+        summary_df = pd.read_sql(summary_query, session.connection())
+        return pa.Table.from_pandas(summary_df, preserve_index=False)
+    return read_sql(summary_query, return_type="arrow")
+
+
+def fetch_expenses_stream(
+    session: Optional[SessionLocal] = None,
+    owner_id: int = 1,
+    type_id: int = 1,
+    batch_size: int = 10_000,
+) -> Iterator[pa.Table]:
+    """
+    Streams expense transaction data in batches, so only one batch is held in memory at a
+    time and the first rows are available before the whole result has been read.
+
+    Args:
+        session (Optional[SessionLocal]): Database session to read through pandas in chunks
+            instead of connectorx, if any.
+        owner_id (int): ID of the owner to filter the expenses. Default is 1.
+        type_id (int): ID of the expense type to filter. Default is 1.
+        batch_size (int): Maximum number of rows per batch. Default is 10,000.
+
+    Yields:
+        pa.Table: Arrow table with the next batch of expense transactions.
+    """
+    expenses_query = _expenses_query(owner_id, type_id)
+    if session is not None:
+        for chunk in pd.read_sql(
+            expenses_query, session.connection(), chunksize=batch_size
+        ):
+            yield pa.Table.from_pandas(chunk, preserve_index=False)
+        return
+
+    reader = read_sql(expenses_query, return_type="arrow_stream", batch_size=batch_size)
+    for batch in reader:
+        if batch.num_rows:
+            yield pa.Table.from_batches([batch])
+
+
+def export_all_expenses(partition_num: Optional[int] = None) -> pa.Table:
+    """
+    Reads the whole expenses table for exports. connectorx splits the scan into id ranges
+    that are read and decoded into Arrow in parallel threads.
+
+    Args:
+        partition_num (Optional[int]): Number of id ranges to read in parallel. Defaults to
+            the number of CPUs.
+
+    Returns:
+        pa.Table: Arrow table with every expense transaction.
+    """
+    return read_sql(
+        EXPORT_QUERY,
+        return_type="arrow",
+        partition_on="id",
+        partition_num=partition_num or os.cpu_count() or 1,
+    )
+
+
+@lru_cache(maxsize=16)
+def _expenses_query(
+    owner_id: int, type_id: int, columns: Tuple[Any, ...] = (ExpenseTransaction,)
+) -> Select:
+    """
+    Builds the query of the expense transactions of an owner and type, most recent first.
+    The statement is reused across calls so its compiled SQL is cached as well.
+
+    Args:
+        owner_id (int): ID of the owner to filter the expenses.
+        type_id (int): ID of the expense type to filter.
+        columns (Tuple[Any, ...]): Entities or columns to select. Default is every column.
+
+    Returns:
+        Select: The SELECT statement.
     """
-    expenses_query = (
-        session.query(ExpenseTransaction)
-        .filter(ExpenseTransaction.owner_id == owner_id)
-        .filter(ExpenseTransaction.type_id == type_id)
+    return (
+        select(*columns)
+        .where(ExpenseTransaction.owner_id == owner_id)
+        .where(ExpenseTransaction.type_id == type_id)
         .order_by(desc(ExpenseTransaction.date))
     )
-    return pd.read_sql(expenses_query.statement, session.bind)
@@ -0,0 +1,29 @@
+from typing import Optional
+
+import polars as pl
+
+from db.database import SessionLocal
+from db.queries.expenses import _expenses_query, fetch_expenses_data
+
+
+def fetch_expenses_pl(
+    session: Optional[SessionLocal] = None, owner_id: int = 1, type_id: int = 1
+) -> pl.DataFrame:
+    """
+    Fetches expense transaction data as a Polars DataFrame, filtered by owner and type, and
+    sorted in descending order. Callers that still need pandas can use `.to_pandas()`.
+
+    Args:
+        session (Optional[SessionLocal]): Database session to read the rows through instead
+            of reading them with connectorx, if any.
+        owner_id (int): ID of the owner to filter the expenses. Default is 1.
+        type_id (int): ID of the expense type to filter. Default is 1.
+
+    Returns:
+        pl.DataFrame: DataFrame containing the filtered and sorted expense transaction data.
+    """
+    if session is None:
+        return pl.from_arrow(fetch_expenses_data(owner_id=owner_id, type_id=type_id))
+    return pl.read_database(
+        _expenses_query(owner_id, type_id), connection=session.connection()
+    )
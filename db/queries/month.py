@@ -1,18 +1,41 @@
+from functools import lru_cache
+from typing import Optional
+
 import pandas as pd
+from sqlalchemy import select
 
-from db.database import SessionLocal
+from db.database import SessionLocal, read_sql
+from db.queries import catalog_generation
 from db.schemas_tables import Month  # Assuming Month is your table model
 
+MONTHS_QUERY = select(Month).order_by(Month.id)
+
 
-def fetch_months_data(session: SessionLocal) -> pd.DataFrame:
+def fetch_months_data(session: Optional[SessionLocal] = None) -> pd.DataFrame:
     """
     Fetches month data from the database.
 
     Args:
-        session (SessionLocal): Database session for querying the data.
+        session (Optional[SessionLocal]): Database session to read through pandas instead
+            of the cached connectorx read, if any.
 
     Returns:
         pd.DataFrame: DataFrame containing month data.
     """
-    months_query = session.query(Month).order_by(Month.id)
-    return pd.read_sql(months_query.statement, session.bind)
+    if session is not None:
+        return pd.read_sql(MONTHS_QUERY, session.connection())
+    return _read_months_data(catalog_generation("Month")).copy()
+
+
+@lru_cache(maxsize=4)
+def _read_months_data(generation: int) -> pd.DataFrame:
+    """
+    Reads the table through connectorx, cached until db.crud writes to it.
+
+    Args:
+        generation (int): Generation of the table, used as the cache key.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the table data.
+    """
+    return read_sql(MONTHS_QUERY)
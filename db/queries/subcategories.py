@@ -1,18 +1,41 @@
+from functools import lru_cache
+from typing import Optional
+
 import pandas as pd
+from sqlalchemy import select
 
-from db.database import SessionLocal
+from db.database import SessionLocal, read_sql
+from db.queries import catalog_generation
 from db.schemas_tables import ExpenseSubcategory
 
+SUBCATEGORIES_QUERY = select(ExpenseSubcategory).order_by(ExpenseSubcategory.id)
+
 
-def fetch_subcategories_data(session: SessionLocal) -> pd.DataFrame:
+def fetch_subcategories_data(session: Optional[SessionLocal] = None) -> pd.DataFrame:
     """
     Fetches month data from the database.
 
     Args:
-        session (SessionLocal): Database session for querying the data.
+        session (Optional[SessionLocal]): Database session to read through pandas instead
+            of the cached connectorx read, if any.
 
     Returns:
         pd.DataFrame: DataFrame containing month data.
     """
-    categories_query = session.query(ExpenseSubcategory).order_by(ExpenseSubcategory.id)
-    return pd.read_sql(categories_query.statement, session.bind)
+    if session is not None:
+        return pd.read_sql(SUBCATEGORIES_QUERY, session.connection())
+    return _read_subcategories_data(catalog_generation("ExpenseSubcategory")).copy()
+
+
+@lru_cache(maxsize=4)
+def _read_subcategories_data(generation: int) -> pd.DataFrame:
+    """
+    Reads the table through connectorx, cached until db.crud writes to it.
+
+    Args:
+        generation (int): Generation of the table, used as the cache key.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the table data.
+    """
+    return read_sql(SUBCATEGORIES_QUERY)
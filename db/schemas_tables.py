@@ -5,10 +5,12 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
 )
+from sqlalchemy.orm import relationship
 
 from db.base_class import Base
 
@@ -18,7 +20,7 @@ class User(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class PaymentMethod(Base):
@@ -26,7 +28,7 @@ class PaymentMethod(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class Month(Base):
@@ -34,7 +36,7 @@ class Month(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class ExpenseCategory(Base):
@@ -42,7 +44,7 @@ class ExpenseCategory(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class ExpenseSubcategory(Base):
@@ -51,7 +53,7 @@ class ExpenseSubcategory(Base):
     category_id = Column(Integer, ForeignKey("expenses_categories.id"))
     name = Column(String)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class ExpenseTransactionType(Base):
@@ -59,7 +61,7 @@ class ExpenseTransactionType(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class ExpenseType(Base):
@@ -67,7 +69,7 @@ class ExpenseType(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class ExpenseTransaction(Base):
@@ -88,7 +90,21 @@ class ExpenseTransaction(Base):
     description = Column(String)
     notes = Column(String)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Catalog relationships refuse lazy loads so per-row N+1 queries fail loudly; load them
+    # with selectinload/joinedload, or join the names in the query as QueryExpenses does.
+    category = relationship("ExpenseCategory", lazy="raise")
+    subcategory = relationship("ExpenseSubcategory", lazy="raise")
+    expense_type = relationship("ExpenseType", lazy="raise")
+    payment_method = relationship("PaymentMethod", lazy="raise")
+
+    # The expenses queries filter by owner and type and list the most recent first, so
+    # this index serves both the filter and the ordering; subcategory joins use the other.
+    __table_args__ = (
+        Index("ix_exp_owner_type_date", owner_id, type_id, date.desc()),
+        Index("ix_exp_subcat", subcategory_id),
+    )
 
 
 class Project(Base):
@@ -100,7 +116,7 @@ class Project(Base):
     client = Column(String)
     notes = Column(String)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class ProjectQuote(Base):
@@ -115,7 +131,7 @@ class ProjectQuote(Base):
     unit = Column(String)
     notes = Column(String)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class IncomeType(Base):
@@ -123,7 +139,7 @@ class IncomeType(Base):
     id = Column(Integer, primary_key=True)
     name = Column(String, unique=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class IncomePayroll(Base):
@@ -146,7 +162,7 @@ class IncomePayroll(Base):
     position = Column(String)
     notes = Column(String)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 
 class IncomeProject(Base):
@@ -172,4 +188,4 @@ class IncomeProject(Base):
     paid_date = Column(DateTime)
     notes = Column(String)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -1,7 +1,27 @@
+import operator
 from abc import ABC, abstractmethod
-from typing import Any, List
+from typing import Any, List, Union
 
 import pandas as pd
+import pyarrow as pa
+
+EXPENSE_COLUMNS = [
+    "id",
+    "category_id",
+    "subcategory_id",
+    "expense_type_id",
+    "payment_method_id",
+    "amount",
+    "tax",
+    "invoice_flag",
+    "date",
+    "vendor",
+    "location",
+    "description",
+    "notes",
+]
+# Reads every expense column of a record in one call, as a tuple.
+_EXPENSE_GETTER = operator.attrgetter(*EXPENSE_COLUMNS)
 
 
 class Formatter(ABC):
@@ -34,46 +54,33 @@ class ObjectFormatter(Formatter):
 
 
 class CategoryListFormatter(Formatter):
-    def format(self, data: List[Any]) -> List[str]:
+    def format(self, data: List[str]) -> List[str]:
         """
-        Formats a list of category objects into a list of category names.
+        Formats the category names fetched by QueryCategory into a list.
 
         Args:
-            data: A list of category objects.
+            data: A sequence of category names.
 
         Returns:
             A list of category names.
         """
-        return [category.name for category in data]
+        return list(data)
 
 
 class ExpenseDataFrameFormatter(Formatter):
-    def format(self, data: List[Any]) -> pd.DataFrame:
+    def format(self, data: Union[List[Any], pa.Table]) -> pd.DataFrame:
         """
         Formats expense data into a pandas DataFrame.
 
         Args:
-            data: A list of expense objects.
+            data: A list of expense objects or an Arrow table of expenses.
 
         Returns:
             A pandas DataFrame with detailed expense information.
         """
-        expense_records = [
-            {
-                "id": item.id,
-                "category_id": item.category_id,
-                "subcategory_id": item.subcategory_id,
-                "expense_type_id": item.expense_type_id,
-                "payment_method_id": item.payment_method_id,
-                "amount": item.amount,
-                "tax": item.tax,
-                "invoice_flag": item.invoice_flag,
-                "date": item.date,
-                "vendor": item.vendor,
-                "location": item.location,
-                "description": item.description,
-                "notes": item.notes,
-            }
-            for item in data
-        ]
-        return pd.DataFrame(expense_records)
+        if isinstance(data, pa.Table):
+            # Arrow columns are converted in bulk instead of row by row.
+            return data.select(EXPENSE_COLUMNS).to_pandas(date_as_object=False)
+
+        rows = list(map(_EXPENSE_GETTER, data))
+        return pd.DataFrame.from_records(rows, columns=EXPENSE_COLUMNS)
@@ -1,5 +1,6 @@
 from typing import Any
 
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
 
@@ -33,9 +34,9 @@ class QueryCategory(Query):
         """
         try:
             with self.session_factory() as session:
-                categories = (
-                    session.query(ExpenseCategory).order_by(ExpenseCategory.id).all()
-                )
+                categories = session.scalars(
+                    select(ExpenseCategory.name).order_by(ExpenseCategory.id)
+                ).all()
                 return self.formatter.format(categories)
         except SQLAlchemyError as e:
             logger.error(f"Database error in QueryCategory: {e}")
@@ -1,9 +1,17 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
-from sqlalchemy import desc, exc
+import pandas as pd
+from sqlalchemy import desc, exc, extract, func, select
 from sqlalchemy.orm import sessionmaker
 
-from db.schemas_tables import ExpenseTransaction
+from db.schemas_tables import (
+    ExpenseCategory,
+    ExpenseSubcategory,
+    ExpenseTransaction,
+    ExpenseType,
+    PaymentMethod,
+)
 from formatters.formatter import Formatter
 from queries.query import Query
 
@@ -30,9 +38,25 @@ class QueryExpenses(Query):
         self.owner_id = owner_id
         self.type_id = type_id
 
-    def execute_query(self) -> Any:
+    def execute_query(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        categories: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Any:
         """
-        Executes a query to fetch expenses transactions based on owner and type.
+        Executes a query to fetch expenses transactions based on owner and type, optionally
+        narrowed down to a year, a month and a set of categories, and to a page of rows.
+        Catalog columns are joined in the query, so they carry names instead of IDs.
+
+        Args:
+            year: Year to filter the expenses by, or None for every year.
+            month: Month number to filter the expenses by, or None for every month.
+            categories: Category names to keep, or None for every category.
+            limit: Maximum number of rows to return, or None for every row.
+            offset: Number of rows to skip before the first returned row.
 
         Returns:
             Formatted query results.
@@ -43,14 +67,242 @@ class QueryExpenses(Query):
         try:
             with self.session_factory() as session:
                 expenses_query = (
-                    session.query(ExpenseTransaction)
-                    .filter(ExpenseTransaction.owner_id == self.owner_id)
-                    .filter(ExpenseTransaction.type_id == self.type_id)
-                    .order_by(desc(ExpenseTransaction.date))
+                    select(
+                        ExpenseTransaction.id,
+                        ExpenseCategory.name.label("category_id"),
+                        ExpenseSubcategory.name.label("subcategory_id"),
+                        ExpenseType.name.label("expense_type_id"),
+                        PaymentMethod.name.label("payment_method_id"),
+                        ExpenseTransaction.amount,
+                        ExpenseTransaction.tax,
+                        ExpenseTransaction.invoice_flag,
+                        ExpenseTransaction.date,
+                        ExpenseTransaction.vendor,
+                        ExpenseTransaction.location,
+                        ExpenseTransaction.description,
+                        ExpenseTransaction.notes,
+                    )
+                    .select_from(ExpenseTransaction)
+                    .outerjoin(
+                        ExpenseCategory,
+                        ExpenseCategory.id == ExpenseTransaction.category_id,
+                    )
+                    .outerjoin(
+                        ExpenseSubcategory,
+                        ExpenseSubcategory.id == ExpenseTransaction.subcategory_id,
+                    )
+                    .outerjoin(
+                        ExpenseType,
+                        ExpenseType.id == ExpenseTransaction.expense_type_id,
+                    )
+                    .outerjoin(
+                        PaymentMethod,
+                        PaymentMethod.id == ExpenseTransaction.payment_method_id,
+                    )
+                    .where(*self._filter_conditions(year, month, categories))
+                    .order_by(
+                        desc(ExpenseTransaction.date), desc(ExpenseTransaction.id)
+                    )
                 )
-                expenses_data = expenses_query.all()
+                if limit is not None:
+                    expenses_query = expenses_query.limit(limit).offset(offset)
+                expenses_data = session.execute(expenses_query).all()
                 return self.formatter.format(expenses_data)
         except exc.SQLAlchemyError as e:
             raise RuntimeError("An error occurred while fetching expenses data.") from e
         except Exception as e:
             raise RuntimeError("An unexpected error occurred in QueryExpenses.") from e
+
+    def fetch_count(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        categories: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Counts the expenses matching the same filters as execute_query.
+
+        Args:
+            year: Year to filter the expenses by, or None for every year.
+            month: Month number to filter the expenses by, or None for every month.
+            categories: Category names to keep, or None for every category.
+
+        Returns:
+            The number of matching expenses.
+
+        Raises:
+            RuntimeError: If an error occurs during the database query.
+        """
+        try:
+            with self.session_factory() as session:
+                count_query = select(func.count(ExpenseTransaction.id)).where(
+                    *self._filter_conditions(year, month, categories)
+                )
+                return session.scalar(count_query)
+        except exc.SQLAlchemyError as e:
+            raise RuntimeError("An error occurred while counting expenses.") from e
+
+    def fetch_totals(
+        self,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        categories: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Sums the amount of the expenses matching the same filters as execute_query, grouped
+        by category and subcategory and labeled with their names.
+
+        Args:
+            year: Year to filter the expenses by, or None for every year.
+            month: Month number to filter the expenses by, or None for every month.
+            categories: Category names to keep, or None for every category.
+
+        Returns:
+            A DataFrame with category_id, subcategory_id and amount columns.
+
+        Raises:
+            RuntimeError: If an error occurs during the database query.
+        """
+        try:
+            with self.session_factory() as session:
+                totals_query = (
+                    select(
+                        ExpenseCategory.name,
+                        ExpenseSubcategory.name,
+                        func.sum(ExpenseTransaction.amount),
+                    )
+                    .select_from(ExpenseTransaction)
+                    .outerjoin(
+                        ExpenseCategory,
+                        ExpenseCategory.id == ExpenseTransaction.category_id,
+                    )
+                    .outerjoin(
+                        ExpenseSubcategory,
+                        ExpenseSubcategory.id == ExpenseTransaction.subcategory_id,
+                    )
+                    .where(*self._filter_conditions(year, month, categories))
+                    .group_by(
+                        ExpenseTransaction.category_id,
+                        ExpenseTransaction.subcategory_id,
+                    )
+                )
+                rows = session.execute(totals_query).all()
+                return pd.DataFrame(
+                    rows, columns=["category_id", "subcategory_id", "amount"]
+                )
+        except exc.SQLAlchemyError as e:
+            raise RuntimeError("An error occurred while summing expenses.") from e
+
+    def fetch_years(self) -> List[int]:
+        """
+        Fetches the distinct years with expenses for the owner and type, most recent first.
+
+        Returns:
+            A list of years.
+
+        Raises:
+            RuntimeError: If an error occurs during the database query.
+        """
+        try:
+            with self.session_factory() as session:
+                # Walk the years from the latest date down, one index seek per year,
+                # instead of extracting the year of every row.
+                years: List[int] = []
+                latest_query = select(func.max(ExpenseTransaction.date)).where(
+                    ExpenseTransaction.owner_id == self.owner_id,
+                    ExpenseTransaction.type_id == self.type_id,
+                )
+                latest = session.scalar(latest_query)
+                while latest is not None:
+                    years.append(latest.year)
+                    latest = session.scalar(
+                        latest_query.where(
+                            ExpenseTransaction.date < datetime(latest.year, 1, 1)
+                        )
+                    )
+                return years
+        except exc.SQLAlchemyError as e:
+            raise RuntimeError(
+                "An error occurred while fetching expenses years."
+            ) from e
+
+    def fetch_version(self) -> Tuple[Any, ...]:
+        """
+        Fetches a cheap token that changes whenever the expenses matching this query are
+        inserted, deleted or re-stamped, to be used as a cache key.
+
+        Returns:
+            A tuple with the row count, the highest ID and the latest update timestamp.
+
+        Raises:
+            RuntimeError: If an error occurs during the database query.
+        """
+        try:
+            with self.session_factory() as session:
+                version_query = (
+                    select(
+                        func.count(ExpenseTransaction.id),
+                        func.max(ExpenseTransaction.id),
+                        func.max(ExpenseTransaction.updated_at),
+                    )
+                    .where(ExpenseTransaction.owner_id == self.owner_id)
+                    .where(ExpenseTransaction.type_id == self.type_id)
+                )
+                return tuple(session.execute(version_query).one())
+        except exc.SQLAlchemyError as e:
+            raise RuntimeError(
+                "An error occurred while fetching expenses version."
+            ) from e
+
+    def _filter_conditions(
+        self,
+        year: Optional[int],
+        month: Optional[int],
+        categories: Optional[List[str]],
+    ) -> List[Any]:
+        """
+        Builds the WHERE conditions shared by the expenses queries.
+
+        Args:
+            year: Year to filter the expenses by, or None for every year.
+            month: Month number to filter the expenses by, or None for every month.
+            categories: Category names to keep, or None for every category.
+
+        Returns:
+            A list of SQLAlchemy conditions.
+        """
+        conditions = [
+            ExpenseTransaction.owner_id == self.owner_id,
+            ExpenseTransaction.type_id == self.type_id,
+        ]
+        if year is not None:
+            # Half-open date ranges keep the (owner_id, type_id, date) index usable.
+            start, end = _period_bounds(year, month)
+            conditions.append(ExpenseTransaction.date >= start)
+            conditions.append(ExpenseTransaction.date < end)
+        elif month is not None:
+            conditions.append(extract("month", ExpenseTransaction.date) == month)
+        if categories is not None:
+            category_ids = select(ExpenseCategory.id).where(
+                ExpenseCategory.name.in_(categories)
+            )
+            conditions.append(ExpenseTransaction.category_id.in_(category_ids))
+        return conditions
+
+
+def _period_bounds(year: int, month: Optional[int] = None) -> Tuple[datetime, datetime]:
+    """
+    Computes the half-open date range covering a year, or one month of it.
+
+    Args:
+        year: Year of the period.
+        month: Month number of the period, or None for the whole year.
+
+    Returns:
+        The first instant of the period and the first instant after it.
+    """
+    if month is None:
+        return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    if month == 12:
+        return datetime(year, 12, 1), datetime(year + 1, 1, 1)
+    return datetime(year, month, 1), datetime(year, month + 1, 1)
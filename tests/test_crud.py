@@ -4,8 +4,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from db.base_class import Base
-from db.crud import create, delete, get_all, get_by_field, update
-from db.schemas_tables import ExpenseCategory
+from db.crud import (
+    create,
+    create_many,
+    delete,
+    get_all,
+    get_all_offset,
+    get_by_field,
+    update,
+)
+from db.schemas_tables import ExpenseCategory, ExpenseTransaction
 
 # Configure test database (using in-memory SQLite for this example)
 engine = create_engine("sqlite:///:memory:")
@@ -31,6 +39,14 @@ def test_create_category(db_session):
     assert category.name == "Test Create Category"
 
 
+def test_create_many_categories(db_session):
+    names = ["Test Bulk Category 1", "Test Bulk Category 2"]
+    create_many(db_session, ExpenseCategory, [{"name": name} for name in names])
+
+    for name in names:
+        assert len(get_by_field(db_session, ExpenseCategory, "name", name)) == 1
+
+
 def test_get_all_categories(db_session):
     # Create test data
     create(db_session, ExpenseCategory, {"name": "Test Read Category 1"})
@@ -40,6 +56,27 @@ def test_get_all_categories(db_session):
     assert len(categories) >= 2
 
 
+def test_get_all_categories_keyset_pages(db_session):
+    for index in range(5):
+        create(db_session, ExpenseCategory, {"name": f"Test Page Category {index}"})
+
+    first_page = get_all(db_session, ExpenseCategory, limit=2)
+    second_page = get_all(
+        db_session, ExpenseCategory, after_id=first_page[-1].id, limit=2
+    )
+    assert len(first_page) == 2
+    assert len(second_page) == 2
+    assert first_page[-1].id < second_page[0].id
+
+
+def test_get_all_offset_is_deprecated(db_session):
+    create(db_session, ExpenseCategory, {"name": "Test Offset Category"})
+
+    with pytest.deprecated_call():
+        categories = get_all_offset(db_session, ExpenseCategory, skip=0, limit=1)
+    assert len(categories) == 1
+
+
 def test_get_category_by_field(db_session):
     category_name = "Test Read Category Field"
     create(db_session, ExpenseCategory, {"name": category_name})
@@ -49,6 +86,12 @@ def test_get_category_by_field(db_session):
     assert categories[0].name == category_name
 
 
+def test_get_by_unknown_field_raises(db_session):
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            get_by_field(db_session, ExpenseCategory, "missing_field", "value")
+
+
 def test_update_category(db_session):
     category_data = {"name": "Category Before Update"}
     category = create(db_session, ExpenseCategory, category_data)
@@ -59,6 +102,23 @@ def test_update_category(db_session):
     assert updated_category.name == "Updated Category"
 
 
+def test_update_keeps_falsy_values(db_session):
+    expense = create(
+        db_session,
+        ExpenseTransaction,
+        {"category_id": 1, "expense_type_id": 1, "amount": 10.0, "invoice_flag": True},
+    )
+    updated_expense = update(
+        db_session,
+        ExpenseTransaction,
+        expense.id,
+        {"amount": 0.0, "invoice_flag": False},
+    )
+
+    assert updated_expense.amount == 0.0
+    assert updated_expense.invoice_flag is False
+
+
 def test_delete_category(db_session):
     category_data = {"name": "Category to Delete"}
     category = create(db_session, ExpenseCategory, category_data)
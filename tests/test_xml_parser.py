@@ -0,0 +1,79 @@
+# tests/test_xml_parser.py
+import io
+
+import pytest
+
+from backend.xml_processing.xml_parser import (
+    extract_cfdi_info,
+    fast_extract_cfdi_info,
+    get_namespace,
+    parse_xml,
+)
+
+CFDI_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+{prolog}<cfdi:Comprobante xmlns:cfdi={q}http://www.sat.gob.mx/cfd/{version}{q} \
+xmlns:nomina12="http://www.sat.gob.mx/nomina12" \
+xmlns:tfd="http://www.sat.gob.mx/TimbreFiscalDigital" SubTotal={q}15000.00{q}>
+  <cfdi:Emisor Nombre={q}ACME {name_suffix}{q} Rfc="AAA010101AAA"/>
+  <cfdi:Complemento>
+    <nomina12:Nomina FechaInicialPago={q}2024-01-01{q} FechaFinalPago="2024-01-15">
+      <nomina12:Receptor Puesto={q}Engineer{q}/>
+      <nomina12:Deducciones>
+        <nomina12:Deduccion TipoDeduccion={q}001{q} Importe={q}300.00{q}/>
+        <nomina12:Deduccion TipoDeduccion="002" Importe="1200.00"/>
+      </nomina12:Deducciones>
+    </nomina12:Nomina>
+    <tfd:TimbreFiscalDigital UUID={q}ABC-123{q}/>
+  </cfdi:Complemento>
+</cfdi:Comprobante>
+"""
+
+
+def build_cfdi(quote='"', version="4", prolog="", name_suffix="SA") -> bytes:
+    return CFDI_TEMPLATE.format(
+        q=quote, version=version, prolog=prolog, name_suffix=name_suffix
+    ).encode()
+
+
+SAMPLE_CFDIS = {
+    "double_quotes": build_cfdi(),
+    "single_quotes": build_cfdi(quote="'"),
+    "cfdi_3": build_cfdi(version="3"),
+    "gt_in_attribute": build_cfdi(name_suffix="S>A"),
+    "entity_reference": build_cfdi(name_suffix="S&amp;A"),
+}
+# Documents the fast path hands over to the XML parser.
+SLOW_PATH_CFDIS = {"entity_reference"}
+
+
+@pytest.mark.parametrize("name", SAMPLE_CFDIS)
+def test_fast_path_matches_xml_parser(name):
+    content = SAMPLE_CFDIS[name]
+    version = get_namespace(io.BytesIO(content))
+
+    fast_info = fast_extract_cfdi_info(content)
+    xml_info = extract_cfdi_info(io.BytesIO(content), version)
+
+    assert xml_info["fiscal_folio"] == "ABC-123"
+    if name in SLOW_PATH_CFDIS:
+        assert fast_info is None
+    else:
+        assert fast_info == xml_info
+
+
+def test_fast_path_skips_documents_missing_required_attributes():
+    content = build_cfdi().replace(b" UUID=", b" Folio=")
+    assert fast_extract_cfdi_info(content) is None
+
+
+def test_get_namespace_falls_back_to_root_element():
+    content = build_cfdi(prolog=f"<!-- {'x' * 5000} -->\n")
+    assert get_namespace(io.BytesIO(content)) == "4"
+
+
+@pytest.mark.parametrize("name", SAMPLE_CFDIS)
+def test_parse_xml(name):
+    data = parse_xml(SAMPLE_CFDIS[name])
+    assert data["fiscal_folio"] == "ABC-123"
+    assert data["gross_income"] == "15000.00"
+    assert (data["imss"], data["isr"]) == ("300.00", "1200.00")